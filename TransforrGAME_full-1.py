@@ -1,8 +1,20 @@
 import pygame
 import sys
+import os
 import random
 import math
+import json
+import re
+import hashlib
+import inspect
+import bisect
+from array import array
+import struct
+import mmap
+import time
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+import numpy as np
 
 pygame.init()
 pygame.mixer.init() 
@@ -13,6 +25,9 @@ GRAVITY = 0.8
 JUMP_FORCE = -16
 MAX_SCROLL_X = 9000  # Extended level width
 TRANSFORM_TIME = 60  # 1 second transformation
+SPRITE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sprite_cache")
+LEVEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "level_cache")
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")
 
 SKY_BLUE = (135, 206, 235)
 DAY_SKY = (100, 180, 255)
@@ -57,70 +72,185 @@ class GameObject:
         self.vel_x = 0
         self.vel_y = 0
         self.on_ground = False
+    
+    @staticmethod
+    def rect_round(values):
+        """What assigning each float in a NumPy array to a Rect field would
+        store: rounded half away from zero"""
+        return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5)).astype(np.int64)
 
 # ================= PARTICLE SYSTEM =================
-class Particle:
-    def __init__(self, x, y, color, velocity=None, lifespan=60, size=None, particle_type="default"):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity = velocity or [random.uniform(-2, 2), random.uniform(-5, -2)]
-        self.lifespan = lifespan
-        self.size = size or random.randint(2, 6)
-        self.age = 0
-        self.particle_type = particle_type
-        self.rotation = random.uniform(0, math.pi * 2)
-        self.rotation_speed = random.uniform(-0.2, 0.2)
+class ParticleSystem:
+    """Every live particle of a level as parallel NumPy arrays.
+    
+    emit() adds a burst. update() applies gravity and drag, shrinks and ages
+    every particle at once and drops the expired ones. draw() blits sprites
+    baked once per colour, size and alpha step (and angle, for sparkles)
+    in a single blits() call.
+    """
+    FIELDS = [
+        ("x", "f8"), ("y", "f8"), ("vel_x", "f8"), ("vel_y", "f8"), ("size", "f8"),
+        ("age", "i8"), ("lifespan", "i8"), ("color", "i8"), ("sparkle", "?"),
+        ("rotation", "f8"), ("rotation_speed", "f8"),
+    ]
+    ALPHA_STEPS = 16
+    ANGLE_STEPS = 8  # Sparkle angles baked per fifth of a turn (the star's symmetry)
+    MAX_DIAMETER = 64
+    COLOR_STEP = 32  # Random burst colours snap to this grid so they share sprites
+    # RGB of each colour id, shared by every level like the sprites
+    palette = []
+    palette_ids = {}
+    _sprites = {}
+    
+    def __init__(self, capacity=256):
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype))
+        self.count = 0
+        self.rng = np.random.default_rng()
+    
+    def __len__(self):
+        return self.count
+    
+    def emit(self, x, y, count, color, velocity=((-2, 2), (-5, -2)), lifespan=60, size=None,
+             particle_type="default"):
+        """Add count particles at (x, y).
+        
+        color is an RGB tuple, or a (low, high) pair of them for a random
+        colour per particle. velocity gives the (low, high) range of each
+        component; lifespan and size are a value or an inclusive (low, high)
+        range, size defaulting to 2-6.
+        """
+        rng = self.rng
+        start, end = self.count, self.count + count
+        if end > len(self.x):
+            capacity = max(end, 2 * len(self.x))
+            for name, dtype in self.FIELDS:
+                values = getattr(self, name)
+                setattr(self, name, np.concatenate([values, np.zeros(capacity - len(values), dtype)]))
+        
+        if isinstance(color[0], tuple):
+            low, high = color
+            rgb = rng.integers(low, np.add(high, 1), (count, 3))
+            # Snapping can step past the range (e.g. 220 to 224), so clamp back
+            # into it: the bounds become two more shared values per channel
+            rgb = np.clip((rgb + self.COLOR_STEP // 2) // self.COLOR_STEP * self.COLOR_STEP, low, high)
+            packed = rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2]
+            unique, inverse = np.unique(packed, return_inverse=True)
+            ids = np.array([self.color_id(((c >> 16) & 255, (c >> 8) & 255, c & 255))
+                            for c in unique.tolist()])
+            self.color[start:end] = ids[inverse]
+        else:
+            self.color[start:end] = self.color_id(tuple(color))
+        
+        def spread(value, integer=False):
+            if not isinstance(value, tuple):
+                return value
+            if integer:
+                return rng.integers(value[0], value[1] + 1, count)
+            return rng.uniform(value[0], value[1], count)
+        
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vel_x[start:end] = spread(velocity[0])
+        self.vel_y[start:end] = spread(velocity[1])
+        self.lifespan[start:end] = spread(lifespan, True)
+        self.size[start:end] = spread((2, 6) if size is None else size, True)
+        self.age[start:end] = 0
+        self.sparkle[start:end] = particle_type == "sparkle"
+        self.rotation[start:end] = rng.uniform(0, math.pi * 2, count)
+        self.rotation_speed[start:end] = rng.uniform(-0.2, 0.2, count)
+        self.count = end
+    
+    @classmethod
+    def color_id(cls, rgb):
+        color_id = cls.palette_ids.get(rgb)
+        if color_id is None:
+            color_id = cls.palette_ids[rgb] = len(cls.palette)
+            cls.palette.append(rgb)
+        return color_id
     
     def update(self):
-        self.x += self.velocity[0]
-        self.y += self.velocity[1]
-        self.velocity[1] += 0.1  # Gravity
+        n = self.count
+        if not n:
+            return
+        vel_x, vel_y = self.vel_x[:n], self.vel_y[:n]
+        self.x[:n] += vel_x
+        self.y[:n] += vel_y
+        vel_y += 0.1  # Gravity
         
         # Add some air resistance
-        self.velocity[0] *= 0.98
-        self.velocity[1] *= 0.99
-        
-        self.age += 1
-        self.rotation += self.rotation_speed
-        
-        # Different decay based on particle type
-        if self.particle_type == "sparkle":
-            self.size = max(0, self.size - 0.02)
-        else:
-            self.size = max(0, self.size - 0.05)
-        
-        return self.age < self.lifespan
+        vel_x *= 0.98
+        vel_y *= 0.99
+        
+        self.age[:n] += 1
+        self.rotation[:n] += self.rotation_speed[:n]
+        
+        # Sparkles shrink slower
+        size = self.size[:n]
+        size -= np.where(self.sparkle[:n], 0.02, 0.05)
+        np.maximum(size, 0, out=size)
+        
+        live = np.flatnonzero(self.age[:n] < self.lifespan[:n])
+        if len(live) < n:
+            for name, dtype in self.FIELDS:
+                values = getattr(self, name)
+                values[:len(live)] = values[live]
+            self.count = len(live)
+    
+    @classmethod
+    def sprite(cls, key):
+        """The baked sprite for a key packed by draw()"""
+        sprite = cls._sprites.get(key)
+        if sprite is None:
+            rest, angle_step = divmod(key, cls.ANGLE_STEPS + 1)
+            rest, alpha_step = divmod(rest, cls.ALPHA_STEPS)
+            color_id, diameter = divmod(rest, cls.MAX_DIAMETER + 1)
+            color = (*cls.palette[color_id], alpha_step * 255 // (cls.ALPHA_STEPS - 1))
+            radius = diameter / 2
+            if angle_step:
+                # Sparkle particles are brighter and star-shaped
+                sprite = pygame.Surface((diameter * 2, diameter * 2), pygame.SRCALPHA)
+                rotation = (angle_step - 1) * math.pi * 2 / 5 / cls.ANGLE_STEPS
+                points = []
+                for i in range(5):
+                    angle = rotation + i * math.pi * 2 / 5
+                    points.append((diameter + math.cos(angle) * diameter, diameter + math.sin(angle) * diameter))
+                    inner_angle = angle + math.pi / 5
+                    points.append((diameter + math.cos(inner_angle) * radius,
+                                   diameter + math.sin(inner_angle) * radius))
+                pygame.draw.polygon(sprite, color, points)
+            else:
+                # Regular circular particles
+                sprite = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, color, (radius, radius), radius)
+            sprite = cls._sprites[key] = AssetCache.to_display_format(sprite)
+        return sprite
     
     def draw(self, screen, scroll_x):
-        alpha = 255 * (1 - self.age / self.lifespan)
-        
-        if self.particle_type == "sparkle":
-            # Sparkle particles are brighter and star-shaped
-            surf = pygame.Surface((self.size * 4, self.size * 4), pygame.SRCALPHA)
-            
-            # Draw a star shape
-            points = []
-            for i in range(5):
-                angle = self.rotation + i * math.pi * 2 / 5
-                outer_x = math.cos(angle) * self.size * 2
-                outer_y = math.sin(angle) * self.size * 2
-                points.append((self.size * 2 + outer_x, self.size * 2 + outer_y))
-                
-                inner_angle = angle + math.pi / 5
-                inner_x = math.cos(inner_angle) * self.size
-                inner_y = math.sin(inner_angle) * self.size
-                points.append((self.size * 2 + inner_x, self.size * 2 + inner_y))
-            
-            if len(points) >= 3:
-                pygame.draw.polygon(surf, (*self.color, int(alpha)), points)
-        else:
-            # Regular circular particles
-            surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*self.color, int(alpha)), 
-                             (self.size, self.size), self.size)
-        
-        screen.blit(surf, (self.x - scroll_x - self.size * 2, self.y - self.size * 2))
+        n = self.count
+        if not n:
+            return
+        size = self.size[:n]
+        # Drawn up and to the left of the particle, as they always were
+        left = (self.x[:n] - scroll_x - size * 2).astype(np.int64)
+        top = (self.y[:n] - size * 2).astype(np.int64)
+        diameter = np.minimum((size * 2).astype(np.int64), self.MAX_DIAMETER)
+        alpha_step = (self.lifespan[:n] - self.age[:n]) * (self.ALPHA_STEPS - 1) // self.lifespan[:n]
+        sparkle = self.sparkle[:n]
+        angle_step = np.where(sparkle, (self.rotation[:n] % (math.pi * 2 / 5))
+                              * (self.ANGLE_STEPS * 5 / (math.pi * 2)), -1).astype(np.int64) + 1
+        extent = np.where(sparkle, diameter * 2, diameter)
+        visible = np.flatnonzero((diameter > 0) & (alpha_step > 0) & (left + extent > 0) & (left < SCREEN_WIDTH)
+                                 & (top + extent > 0) & (top < SCREEN_HEIGHT))
+        if not len(visible):
+            return
+        keys = (((self.color[visible] * (self.MAX_DIAMETER + 1) + diameter[visible]) * self.ALPHA_STEPS
+                 + alpha_step[visible]) * (self.ANGLE_STEPS + 1) + angle_step[visible])
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sprites = [self.sprite(key) for key in unique.tolist()]
+        screen.blits(list(zip([sprites[i] for i in inverse.tolist()],
+                              zip(left[visible].tolist(), top[visible].tolist()))),
+                     doreturn=False)
 
 # ================= ENHANCED ASSET MANAGEMENT =================
 class Assets:
@@ -763,6 +893,21 @@ class Assets:
         
         return surf
     
+    @staticmethod
+    def create_platform_tiles():
+        """The shared tile variants, in Platform.TILE_VARIANTS order"""
+        ground = Assets.create_tile(True)
+        bare = Assets.create_tile(False)
+        
+        moving = bare.copy()
+        moving.fill((100, 70, 30))
+        
+        breakable = bare.copy()
+        breakable.fill((150, 100, 50))
+        pygame.draw.rect(breakable, (100, 60, 30), (0, 0, 64, 64), 4)
+        
+        return [ground, bare, moving, breakable]
+    
     @staticmethod
     def create_projectile(is_player=True):
         if is_player:
@@ -810,16 +955,46 @@ class Assets:
             return surf
     
     @staticmethod
-    def create_transformation_frames(start_mode, end_mode):
-        """Create transformation animation frames between modes"""
+    def create_enemy_projectile(kind="orb"):
+        """Enemy shots: orb (default), honey, wave (mantis), sting (scorpion), blast (beetle)"""
+        if kind == "honey":
+            surf = pygame.Surface((15, 20), pygame.SRCALPHA)
+            pygame.draw.ellipse(surf, (255, 220, 0), (0, 0, 15, 20)) # Golden Yellow
+            pygame.draw.circle(surf, (255, 255, 255, 150), (5, 5), 3) # Highlight
+        elif kind == "wave":
+            # Green energy blade look
+            surf = pygame.Surface((30, 40), pygame.SRCALPHA)
+            pygame.draw.ellipse(surf, (0, 255, 100, 180), (0, 0, 10, 40))
+        elif kind == "sting":
+            # Purple venom look
+            surf = pygame.Surface((12, 12), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (180, 0, 255), (6, 6), 6)
+        elif kind == "blast":
+            # Large red/black blast
+            surf = pygame.Surface((25, 25), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (50, 0, 0), (12, 12), 12)
+            pygame.draw.circle(surf, (255, 0, 0), (12, 12), 8)
+        else:
+            surf = pygame.Surface((12, 12), pygame.SRCALPHA)
+            proj_color = (255, 100, 0) # Default orange
+            pygame.draw.circle(surf, proj_color, (8, 8), 8)
+            # Add a little glow
+            pygame.draw.circle(surf, (255, 255, 255, 150), (8, 8), 4)
+        return surf
+
+    @staticmethod
+    def create_transformation_frames(start_mode, end_mode, hero_frames, vehicle_frames):
+        """Create transformation animation frames between modes.
+
+        Works from the already baked hero/vehicle frames. The energy particles
+        are random on every transform, so they are not part of the frames;
+        draw_transformation_particles overlays them live.
+        """
         frames = []
         steps = 30  # Half-second transformation at 60 FPS
         
         if start_mode == "hero" and end_mode == "vehicle":
             # Robot to vehicle transformation
-            hero_frames = Assets.create_player_frames()
-            vehicle_frames = Assets.create_vehicle_frames()
-            
             for i in range(steps):
                 progress = i / (steps - 1)
                 surf = pygame.Surface((100, 90), pygame.SRCALPHA)
@@ -852,22 +1027,9 @@ class Assets:
                     vehicle_scaled.set_alpha(vehicle_alpha)
                     surf.blit(vehicle_scaled, (50 - width//2, 45 - height//2))
                 
-                # Transformation particles
-                for j in range(int(progress * 20)):
-                    angle = random.uniform(0, math.pi * 2)
-                    distance = energy_radius * random.uniform(0.5, 1.0)
-                    x = 50 + math.cos(angle) * distance
-                    y = 45 + math.sin(angle) * distance
-                    size = random.randint(2, 5)
-                    color = (0, 255, 255) if random.random() > 0.5 else (255, 100, 100)
-                    pygame.draw.circle(surf, (*color, 200), (int(x), int(y)), size)
-                
                 frames.append(surf)
         
         else:  # Vehicle to robot transformation
-            hero_frames = Assets.create_player_frames()
-            vehicle_frames = Assets.create_vehicle_frames()
-            
             for i in range(steps):
                 progress = i / (steps - 1)
                 surf = pygame.Surface((100, 90), pygame.SRCALPHA)
@@ -900,27 +1062,685 @@ class Assets:
                     robot_scaled.set_alpha(robot_alpha)
                     surf.blit(robot_scaled, (50 - width//2, 45 - height//2))
                 
-                # Transformation particles
-                for j in range(int(progress * 20)):
-                    angle = random.uniform(0, math.pi * 2)
-                    distance = energy_radius * random.uniform(0.5, 1.0)
-                    x = 50 + math.cos(angle) * distance
-                    y = 45 + math.sin(angle) * distance
-                    size = random.randint(2, 5)
-                    color = (255, 100, 100) if random.random() > 0.5 else (0, 255, 255)
-                    pygame.draw.circle(surf, (*color, 200), (int(x), int(y)), size)
-                
                 frames.append(surf)
-        
+
+        return frames
+
+    @staticmethod
+    def create_transformation_sparks():
+        """Energy particle dots: cyan sizes 2-5, then red sizes 2-5"""
+        sparks = []
+        for color in [(0, 255, 255), (255, 100, 100)]:
+            for size in range(2, 6):
+                surf = pygame.Surface((size * 2 + 1, size * 2 + 1), pygame.SRCALPHA)
+                pygame.draw.circle(surf, (*color, 200), (size, size), size)
+                sparks.append(surf)
+        return sparks
+
+    @staticmethod
+    def create_clouds(seed):
+        """The 8 background clouds (fluffy, wispy, storm in turn); the wispy
+        ones are rolled from a random seeded per level, so they hold still"""
+        rng = random.Random(seed)
+        clouds = []
+        for i in range(8):
+            cloud_surf = pygame.Surface((180, 80), pygame.SRCALPHA)
+            cloud_type = i % 3
+            if cloud_type == 0:  # Fluffy cloud
+                pygame.draw.ellipse(cloud_surf, (255, 255, 255, 220), (0, 40, 100, 30))
+                pygame.draw.ellipse(cloud_surf, (255, 255, 255, 220), (40, 30, 120, 40))
+                pygame.draw.ellipse(cloud_surf, (255, 255, 255, 220), (80, 40, 100, 30))
+            
+            elif cloud_type == 1:  # Wispy cloud
+                for j in range(5):
+                    offset = j * 25
+                    width = 60 + rng.randint(-10, 10)
+                    height = 20 + rng.randint(-5, 5)
+                    alpha = 180 + rng.randint(-30, 30)
+                    pygame.draw.ellipse(cloud_surf, (255, 255, 255, alpha),
+                                      (offset, 30 + j * 8, width, height))
+            
+            else:  # Storm cloud
+                pygame.draw.ellipse(cloud_surf, (150, 150, 170, 200), (0, 30, 160, 50))
+                pygame.draw.ellipse(cloud_surf, (130, 130, 150, 180), (20, 40, 140, 40))
+            clouds.append(cloud_surf)
+        return clouds
+
+    @staticmethod
+    def create_crystal_glow():
+        """Glowing cave crystal for the boss level background"""
+        crystal_surf = pygame.Surface((40, 60), pygame.SRCALPHA)
+        for j in range(5):
+            alpha = 100 - j * 20
+            pygame.draw.polygon(crystal_surf, (100, 200, 255, alpha),
+                              [(20, 0), (0, 60), (40, 60)])
+        return crystal_surf
+
+    @staticmethod
+    def draw_transformation_particles(screen, center_x, center_y, progress):
+        """Random energy particles around a transforming player"""
+        sparks = AssetCache.get("transformation_sparks")
+        energy_radius = 50 + math.sin(progress * math.pi) * 20
+        for j in range(int(progress * 20)):
+            angle = random.uniform(0, math.pi * 2)
+            distance = energy_radius * random.uniform(0.5, 1.0)
+            x = center_x + math.cos(angle) * distance
+            y = center_y + math.sin(angle) * distance
+            size = random.randint(2, 5)
+            color = 0 if random.random() > 0.5 else 4
+            screen.blit(sparks[color + size - 2], (int(x) - size, int(y) - size))
+
+# ================= ASSET CACHE =================
+class SpriteStore:
+    """On-disk cache of baked frames as raw pixel buffers plus a JSON manifest.
+
+    Each entry remembers a hash of its generator's source code and of every
+    Assets helper it calls, so editing an Assets.create_* function or one of
+    its helpers invalidates that entry on the next launch.
+    Cached files are memory-mapped and the surfaces are built straight on top
+    of the mapping with pygame.image.frombuffer.
+    """
+    VERSION = 1
+    MANIFEST = "manifest.json"
+
+    def __init__(self, path):
+        self.path = path
+        self.manifest = None
+        self._maps = {}
+        self._hashes = {}
+
+    def _load_manifest(self):
+        if self.manifest is None:
+            try:
+                with open(os.path.join(self.path, self.MANIFEST)) as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError):
+                self.manifest = {}
+            if self.manifest.get('version') != self.VERSION:
+                self.manifest = {'version': self.VERSION, 'entries': {}}
+        return self.manifest['entries']
+
+    @staticmethod
+    def dependencies(kind):
+        """Names of the Assets functions a generator draws through: itself
+        and every Assets.<name> it calls, transitively, in sorted order"""
+        names = set()
+        pending = ["create_" + kind]
+        while pending:
+            name = pending.pop()
+            if name in names or not hasattr(Assets, name):
+                continue
+            names.add(name)
+            pending.extend(re.findall(r"\bAssets\.(\w+)", inspect.getsource(getattr(Assets, name))))
+        return sorted(names)
+
+    def source_hash(self, kind):
+        """Hash of the generator's code, or None when the source is not
+        available (e.g. an install with only .pyc files)"""
+        if kind not in self._hashes:
+            digest = hashlib.sha1()
+            try:
+                for name in self.dependencies(kind):
+                    digest.update(inspect.getsource(getattr(Assets, name)).encode())
+                self._hashes[kind] = digest.hexdigest()
+            except (OSError, TypeError):
+                self._hashes[kind] = None
+        return self._hashes[kind]
+
+    @staticmethod
+    def pixel_format(surf):
+        return "RGBA" if surf.get_flags() & pygame.SRCALPHA else "RGB"
+
+    @staticmethod
+    def entry_name(kind, params):
+        return "-".join([kind] + [str(p) for p in params])
+
+    def load(self, kind, params):
+        name = self.entry_name(kind, params)
+        source_hash = self.source_hash(kind)
+        if source_hash is None:
+            return None
+        entry = self._load_manifest().get(name)
+        if entry is None or entry['hash'] != source_hash:
+            return None
+
+        try:
+            with open(os.path.join(self.path, entry['file']), 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return None
+        if len(data) != entry['size']:
+            return None
+        self._maps[name] = data
+
+        view = memoryview(data)
+        frames = []
+        for width, height, offset, fmt in entry['frames']:
+            length = width * height * len(fmt)
+            frames.append(pygame.image.frombuffer(view[offset:offset + length], (width, height), fmt))
+        return frames[0] if entry['single'] else tuple(frames)
+
+    def save(self, kind, params, asset):
+        source_hash = self.source_hash(kind)
+        if source_hash is None:
+            return  # Nothing to tell a stale entry by, so the asset is baked every launch
+        name = self.entry_name(kind, params)
+        surfaces = (asset,) if isinstance(asset, pygame.Surface) else asset
+
+        frames = []
+        chunks = []
+        offset = 0
+        for surf in surfaces:
+            fmt = SpriteStore.pixel_format(surf)
+            raw = pygame.image.tobytes(surf, fmt)
+            frames.append((surf.get_width(), surf.get_height(), offset, fmt))
+            chunks.append(raw)
+            offset += len(raw)
+
+        entries = self._load_manifest()
+        entries[name] = {
+            'hash': source_hash,
+            'file': name + ".bin",
+            'size': offset,
+            'single': isinstance(asset, pygame.Surface),
+            'frames': frames,
+        }
+        # If the directory is not writable, forget the entry again so the
+        # manifest never names a missing file; the asset is only in memory
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(os.path.join(self.path, name + ".bin"), 'wb') as f:
+                f.write(b"".join(chunks))
+            tmp_path = os.path.join(self.path, self.MANIFEST + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(self.manifest, f)
+            os.replace(tmp_path, os.path.join(self.path, self.MANIFEST))
+        except OSError:
+            entries.pop(name, None)
+
+    def release(self, kind, params):
+        # Surfaces still holding the buffer keep the mapping alive on their own
+        self._maps.pop(self.entry_name(kind, params), None)
+
+
+class SpriteAtlas:
+    """Packs small surfaces into a few large pages using shelf packing.
+
+    add() copies a surface onto the first shelf with room for it and returns
+    a subsurface of that page, which blits exactly like the original but
+    keeps the pixels of every sprite in a handful of big allocations.
+    """
+    PADDING = 1
+
+    def __init__(self, page_size, flags=pygame.SRCALPHA):
+        self.page_size = page_size
+        self.flags = flags
+        self.pages = []
+        self.shelves = []    # Per page: [y, height, next_x] for each shelf
+        self.page_tops = []  # Per page: first y not used by any shelf
+        self.display_format = False
+
+    def add(self, surf):
+        width, height = surf.get_size()
+        if width > self.page_size or height > self.page_size:
+            return surf
+        page_index, x, y = self._find_spot(width, height)
+        page = self.pages[page_index]
+        if self.flags & pygame.SRCALPHA:
+            # The page starts fully transparent, so MAX copies pixels verbatim
+            page.blit(surf, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            page.blit(surf, (x, y))
+        return page.subsurface((x, y, width, height))
+
+    def add_many(self, surfaces):
+        # Tallest first keeps shelves tight
+        order = sorted(range(len(surfaces)), key=lambda i: -surfaces[i].get_height())
+        packed = [None] * len(surfaces)
+        for i in order:
+            packed[i] = self.add(surfaces[i])
+        return tuple(packed)
+
+    def _find_spot(self, width, height):
+        for page_index, shelves in enumerate(self.shelves):
+            for shelf in shelves:
+                y, shelf_height, next_x = shelf
+                if height <= shelf_height and next_x + width <= self.page_size:
+                    shelf[2] = next_x + width + self.PADDING
+                    return page_index, next_x, y
+            top = self.page_tops[page_index]
+            if top + height <= self.page_size:
+                shelves.append([top, height, width + self.PADDING])
+                self.page_tops[page_index] = top + height + self.PADDING
+                return page_index, 0, top
+
+        self.pages.append(self._new_page())
+        self.shelves.append([[0, height, width + self.PADDING]])
+        self.page_tops.append(height + self.PADDING)
+        return len(self.pages) - 1, 0, 0
+
+    def _new_page(self):
+        page = pygame.Surface((self.page_size, self.page_size), self.flags)
+        if self.display_format:
+            page = page.convert_alpha() if self.flags & pygame.SRCALPHA else page.convert()
+        return page
+
+    def convert_for_display(self):
+        """Swap every page for a copy in the display's pixel format.
+
+        Returns {id(old page): new page} so holders of subsurfaces can rebind
+        them; pages created afterwards start out in display format.
+        """
+        moved = {}
+        for i, page in enumerate(self.pages):
+            converted = page.convert_alpha() if self.flags & pygame.SRCALPHA else page.convert()
+            moved[id(page)] = converted
+            self.pages[i] = converted
+        self.display_format = True
+        return moved
+
+
+def bake_in_worker(kind, params):
+    """ProcessPoolExecutor task: run one generator and return its pixels,
+    with the time the generator took"""
+    start = time.perf_counter()
+    asset = getattr(Assets, "create_" + kind)(*params)
+    elapsed = time.perf_counter() - start
+    single = isinstance(asset, pygame.Surface)
+    frames = []
+    for surf in ((asset,) if single else asset):
+        fmt = SpriteStore.pixel_format(surf)
+        frames.append((surf.get_size(), fmt, pygame.image.tobytes(surf, fmt)))
+    return single, frames, elapsed
+
+
+class AssetCache:
+    """Process-wide registry of baked Assets, shared by every entity.
+
+    Entries are keyed by (kind, params) where kind names an Assets.create_*
+    generator, e.g. get("enemy_scorpion") or get("tile", True). Frame lists
+    are handed out as tuples; the surfaces are shared, so callers must copy()
+    before drawing on them. Misses are served from the on-disk SpriteStore
+    when it has an up-to-date copy, and baked (then written back) otherwise.
+
+    get_bank() adds the mirrored orientation of an asset, so entities pick
+    their frame by index instead of flipping every frame, and
+    get_flash_bank() holds the same frames tinted for hit flashes (get_flash()
+    tints just the unmirrored frames, for sprites that never turn). surface_allocs
+    counts every surface the cache has created; it stays flat once a level
+    is running.
+
+    Everything the cache hands out is packed into SpriteAtlas pages (one
+    atlas for translucent sprites, one for opaque tiles), so the frames are
+    subsurfaces of a few large surfaces.
+    """
+    _entries = {}
+    _banks = {}
+    _flash_banks = {}
+    _flashes = {}
+    hits = 0
+    misses = 0
+    surface_allocs = 0
+    store = SpriteStore(SPRITE_CACHE_DIR)
+    atlas = SpriteAtlas(1024)
+    opaque_atlas = SpriteAtlas(256, flags=0)
+
+    # Every generator output the game can ask for, used by bake_all()
+    ALL_ASSETS = [
+        ("player_frames", ()), ("vehicle_frames", ()),
+        ("enemy_bee", ()), ("enemy_beetle", ()), ("enemy_scorpion", ()),
+        ("enemy_snail", ()), ("enemy_caterpillar", ()), ("enemy_mantis", ()),
+        ("enemy_spider", ()), ("boss", ()),
+        ("powerup", ("weapon",)), ("powerup", ("health",)),
+        ("platform_tiles", ()),
+        ("projectile", (True,)), ("transformation_sparks", ()),
+        ("enemy_projectile", ("orb",)), ("enemy_projectile", ("honey",)),
+        ("enemy_projectile", ("wave",)), ("enemy_projectile", ("sting",)),
+        ("enemy_projectile", ("blast",)),
+        ("clouds", (0,)), ("clouds", (1,)), ("clouds", (2,)), ("clouds", (4,)),
+        ("crystal_glow", ()),
+    ]
+
+    @classmethod
+    def get(cls, kind, *params):
+        key = (kind, params)
+        asset = cls._entries.get(key)
+        if asset is None:
+            cls.misses += 1
+            asset = cls._add_entry(key, cls.bake(kind, params))
+        else:
+            cls.hits += 1
+        return asset
+
+    @classmethod
+    def get_transformation(cls, start_mode, end_mode):
+        """Transformation animation, baked once per direction from the cached
+        hero and vehicle frames (kept in memory only)"""
+        key = ("transformation_frames", (start_mode, end_mode))
+        frames = cls._entries.get(key)
+        if frames is None:
+            cls.misses += 1
+            frames = cls._add_entry(key, tuple(Assets.create_transformation_frames(
+                start_mode, end_mode, cls.get("player_frames"), cls.get("vehicle_frames"))))
+        else:
+            cls.hits += 1
+        return frames
+
+    @classmethod
+    def get_bank(cls, kind, *params):
+        """Frames of an asset in both orientations: bank[mirrored][index]"""
+        key = (kind, params)
+        bank = cls._banks.get(key)
+        if bank is None:
+            frames = cls.get(kind, *params)
+            if isinstance(frames, pygame.Surface):
+                frames = (frames,)
+            mirrored = cls.pack([pygame.transform.flip(frame, True, False) for frame in frames])
+            cls.surface_allocs += len(mirrored)
+            bank = (frames, mirrored)
+            cls._banks[key] = bank
+        return bank
+
+    @classmethod
+    def get_flash_bank(cls, kind, *params):
+        """get_bank() tinted for damage flashes, same [mirrored][index] layout"""
+        key = (kind, params)
+        bank = cls._flash_banks.get(key)
+        if bank is None:
+            bank = tuple(cls.pack([cls.flash_frame(frame) for frame in frames])
+                         for frames in cls.get_bank(kind, *params))
+            cls.surface_allocs += sum(len(frames) for frames in bank)
+            cls._flash_banks[key] = bank
+        return bank
+
+    @classmethod
+    def get_flash(cls, kind, *params):
+        """Frames of an asset tinted for damage flashes, without a mirrored copy"""
+        key = (kind, params)
+        frames = cls._flashes.get(key)
+        if frames is None:
+            frames = cls.get(kind, *params)
+            if isinstance(frames, pygame.Surface):
+                frames = (frames,)
+            frames = cls.pack([cls.flash_frame(frame) for frame in frames])
+            cls.surface_allocs += len(frames)
+            cls._flashes[key] = frames
         return frames
 
+    @staticmethod
+    def flash_frame(frame):
+        flash = frame.copy()
+        flash.fill((255, 255, 255, 128), special_flags=pygame.BLEND_RGBA_MULT)
+        return flash
+
+    @classmethod
+    def _add_entry(cls, key, asset):
+        if isinstance(asset, pygame.Surface):
+            asset = cls.pack([asset])[0]
+            cls.surface_allocs += 1
+        else:
+            asset = cls.pack(asset)
+            cls.surface_allocs += len(asset)
+        cls._entries[key] = asset
+        # The pixels now live in the atlas, the disk mapping is not needed
+        if cls.store is not None:
+            cls.store.release(*key)
+        return asset
+
+    @staticmethod
+    def to_display_format(surf):
+        """convert()/convert_alpha() a surface once a display mode is set"""
+        if pygame.display.get_surface() is None:
+            return surf
+        if surf.get_flags() & pygame.SRCALPHA:
+            return surf.convert_alpha()
+        return surf.convert()
+
+    @classmethod
+    def convert_for_display(cls):
+        """Post-bake pass: move every cached surface to the display format.
+
+        Called by Game.__init__ right after set_mode. Atlas pages are
+        converted once (convert() for opaque tiles, convert_alpha() for the
+        rest) and the handed-out frames are rebound to the new pages.
+        """
+        moved = cls.atlas.convert_for_display()
+        moved.update(cls.opaque_atlas.convert_for_display())
+        # {id(old): (old, new)} for every surface and frame tuple rebound so
+        # far, so a bank's unmirrored frames stay the entry itself (old is
+        # kept alive so its id cannot be reused meanwhile)
+        rebound = {}
+
+        def rebind(surf):
+            if id(surf) not in rebound:
+                parent = surf.get_parent()
+                if parent is not None and id(parent) in moved:
+                    new = moved[id(parent)].subsurface((surf.get_offset(), surf.get_size()))
+                else:
+                    new = cls.to_display_format(surf)
+                rebound[id(surf)] = (surf, new)
+            return rebound[id(surf)][1]
+
+        def rebind_frames(frames):
+            if id(frames) not in rebound:
+                rebound[id(frames)] = (frames, tuple(rebind(surf) for surf in frames))
+            return rebound[id(frames)][1]
+
+        for key, asset in cls._entries.items():
+            if isinstance(asset, pygame.Surface):
+                cls._entries[key] = rebind(asset)
+            else:
+                cls._entries[key] = rebind_frames(asset)
+        for banks in (cls._banks, cls._flash_banks):
+            for key, bank in banks.items():
+                banks[key] = tuple(rebind_frames(frames) for frames in bank)
+        for key, frames in cls._flashes.items():
+            cls._flashes[key] = rebind_frames(frames)
+
+    @classmethod
+    def pack(cls, surfaces):
+        """Copy surfaces of one asset into the matching atlas"""
+        if surfaces and surfaces[0].get_flags() & pygame.SRCALPHA:
+            return cls.atlas.add_many(surfaces)
+        return cls.opaque_atlas.add_many(surfaces)
+
+    @classmethod
+    def bake(cls, kind, params):
+        if cls.store is not None:
+            asset = cls.store.load(kind, params)
+            if asset is not None:
+                return asset
+
+        asset = getattr(Assets, "create_" + kind)(*params)
+        if isinstance(asset, list):
+            asset = tuple(asset)
+        if cls.store is not None:
+            cls.store.save(kind, params, asset)
+        return asset
+
+    @classmethod
+    def bake_all(cls):
+        """Make sure every known asset is in memory (and on disk)"""
+        for kind, params in cls.ALL_ASSETS:
+            cls.get(kind, *params)
+
+    @classmethod
+    def bake_all_parallel(cls, workers=None):
+        """bake_all() with the generators spread over a process pool.
+
+        Assets already fresh on disk are just mapped in; the rest are baked
+        by workers that send back raw pixel bytes. With a single core (or a
+        single asset to bake) a pool cannot win, so they are baked here
+        instead. Returns the number of generators run, the wall-clock time
+        and the time they would have taken one after another.
+        """
+        start = time.perf_counter()
+        pending = []
+        for kind, params in cls.ALL_ASSETS:
+            if (kind, params) in cls._entries:
+                continue
+            asset = cls.store.load(kind, params) if cls.store is not None else None
+            if asset is not None:
+                cls.misses += 1
+                cls._add_entry((kind, params), asset)
+            else:
+                pending.append((kind, params))
+
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers < 2:
+            for kind, params in pending:
+                cls.get(kind, *params)
+            wall = time.perf_counter() - start
+            return len(pending), wall, wall
+
+        serial = 0.0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(bake_in_worker, kind, params) for kind, params in pending]
+            for (kind, params), future in zip(pending, futures):
+                single, frames, elapsed = future.result()
+                serial += elapsed
+                surfaces = [pygame.image.frombytes(raw, size, fmt) for size, fmt, raw in frames]
+                asset = surfaces[0] if single else tuple(surfaces)
+                cls.misses += 1
+                cls._add_entry((kind, params), asset)
+                if cls.store is not None:
+                    cls.store.save(kind, params, asset)
+        return len(pending), time.perf_counter() - start, serial
+
+    @classmethod
+    def evict(cls, kind=None, *params):
+        """Drop cached entries: everything, one kind, or one (kind, params).
+
+        The atlases are repacked afterwards, so the evicted pixels are
+        really freed rather than left behind in the pages.
+        """
+        if kind is None:
+            keys = list(cls._entries)
+        elif params:
+            keys = [(kind, params)] if (kind, params) in cls._entries else []
+        else:
+            keys = [key for key in cls._entries if key[0] == kind]
+        for key in keys:
+            cls._drop(key)
+        if keys:
+            cls.repack()
+        return len(keys)
+
+    @classmethod
+    def _drop(cls, key):
+        del cls._entries[key]
+        cls._banks.pop(key, None)
+        cls._flash_banks.pop(key, None)
+        cls._flashes.pop(key, None)
+        if cls.store is not None:
+            cls.store.release(*key)
+
+    @classmethod
+    def preload(cls, manifest):
+        """Bake exactly the assets in a manifest and evict everything else.
+
+        Besides (kind, params) entries a manifest lists the frames derived
+        from them as ("bank", (kind, *params)), ("flash_bank", ...) and
+        ("flash", ...), so nothing is baked when an entity streams in later.
+        Space freed by the eviction is reclaimed by repacking the atlases, so
+        memory follows the current level instead of growing per level.
+        """
+        views = {"bank": (cls._banks, cls.get_bank), "flash_bank": (cls._flash_banks, cls.get_flash_bank),
+                 "flash": (cls._flashes, cls.get_flash)}
+        stale = [key for key in cls._entries if key not in manifest]
+        for key in stale:
+            cls._drop(key)
+        unused = 0
+        for view, (cache, getter) in views.items():
+            for key in [key for key in cache if (view, (key[0],) + key[1]) not in manifest]:
+                del cache[key]
+                unused += 1
+        if stale or unused:
+            cls.repack()
+        for kind, params in manifest:
+            if kind == "transformation_frames":
+                cls.get_transformation(*params)
+            elif kind in views:
+                views[kind][1](*params)
+            else:
+                cls.get(kind, *params)
+        return len(stale)
+
+    @classmethod
+    def repack(cls):
+        """Copy the live assets into fresh atlases and drop the old pages.
+
+        The copies are moves of surfaces already counted, so they are not
+        added to surface_allocs.
+        """
+        atlas, opaque_atlas = cls.atlas, cls.opaque_atlas
+        cls.atlas = SpriteAtlas(atlas.page_size, atlas.flags)
+        cls.opaque_atlas = SpriteAtlas(opaque_atlas.page_size, opaque_atlas.flags)
+        cls.atlas.display_format = atlas.display_format
+        cls.opaque_atlas.display_format = opaque_atlas.display_format
+
+        repacked = {}
+        for key, asset in cls._entries.items():
+            if isinstance(asset, pygame.Surface):
+                cls._entries[key] = cls.pack([asset])[0]
+            else:
+                cls._entries[key] = cls.pack(asset)
+            repacked[id(asset)] = cls._entries[key]
+
+        def rebind(frames):
+            # A bank's unmirrored frames are the entry itself, keep sharing it
+            if id(frames) in repacked:
+                return repacked[id(frames)]
+            if len(frames) == 1 and id(frames[0]) in repacked:
+                return (repacked[id(frames[0])],)
+            return cls.pack(frames)
+
+        for banks in (cls._banks, cls._flash_banks):
+            for key, bank in banks.items():
+                banks[key] = tuple(rebind(frames) for frames in bank)
+        for key, frames in cls._flashes.items():
+            cls._flashes[key] = cls.pack(frames)
+
+    @classmethod
+    def all_surfaces(cls):
+        for asset in cls._entries.values():
+            yield from (asset,) if isinstance(asset, pygame.Surface) else asset
+        for frames, mirrored in cls._banks.values():
+            yield from mirrored
+        for bank in cls._flash_banks.values():
+            for frames in bank:
+                yield from frames
+        for frames in cls._flashes.values():
+            yield from frames
+
+    @classmethod
+    def stats(cls):
+        surfaces = 0
+        pixel_bytes = 0
+        for surf in cls.all_surfaces():
+            surfaces += 1
+            pixel_bytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        return {
+            'entries': len(cls._entries),
+            'surfaces': surfaces,
+            'bytes': pixel_bytes,
+            'hits': cls.hits,
+            'misses': cls.misses,
+            'surface_allocs': cls.surface_allocs,
+            'atlas_pages': len(cls.atlas.pages) + len(cls.opaque_atlas.pages),
+        }
+
 # ================= GAME OBJECTS =================
 class Player(GameObject):
     def __init__(self, x, y):
         super().__init__(x, y, 60, 90)
         self.mode = "hero"  # "hero" or "vehicle"
-        self.hero_frames = Assets.create_player_frames()
-        self.vehicle_frames = Assets.create_vehicle_frames()
+        self.hero_bank = AssetCache.get_bank("player_frames")
+        self.vehicle_bank = AssetCache.get_bank("vehicle_frames")
+        self.hero_flash_bank = AssetCache.get_flash_bank("player_frames")
+        self.vehicle_flash_bank = AssetCache.get_flash_bank("vehicle_frames")
+        self.hero_frames = self.hero_bank[0]
+        self.vehicle_frames = self.vehicle_bank[0]
         self.current_frame = 0
         self.animation_timer = 0
         self.image = self.hero_frames[0]
@@ -942,23 +1762,17 @@ class Player(GameObject):
     def update_image(self):
    
         ##
+        # Flash effect when invincible uses the pre-tinted frames
+        flashing = self.invincible_timer > 0 and self.invincible_timer % 4 < 2
         if self.mode == "hero":
-            frames = self.hero_frames
+            bank = self.hero_flash_bank if flashing else self.hero_bank
         else:
-            frames = self.vehicle_frames
-        
-        self.image = frames[self.current_frame]
-        
-        # Flip image based on direction
-        if self.direction == -1:
-            self.image = pygame.transform.flip(self.image, True, False)
+            bank = self.vehicle_flash_bank if flashing else self.vehicle_bank
         
-        # Flash effect when invincible
-        if self.invincible_timer > 0 and self.invincible_timer % 4 < 2:
-            self.image = self.image.copy()
-            self.image.fill((255, 255, 255, 128), special_flags=pygame.BLEND_RGBA_MULT)
+        # Pick the pre-flipped frame based on direction
+        self.image = bank[1 if self.direction == -1 else 0][self.current_frame]
     
-    def update(self, keys, platforms, scroll_x):
+    def update(self, keys, level, scroll_x):
         # Handle input
         self.handle_input(keys)
         
@@ -977,11 +1791,11 @@ class Player(GameObject):
         
         # Update position
         self.rect.x += self.vel_x
-        self.check_horizontal_collisions(platforms)
+        self.check_horizontal_collisions(level)
         
         self.rect.y += self.vel_y
         self.on_ground = False
-        self.check_vertical_collisions(platforms)
+        self.check_vertical_collisions(level)
         
         # Animation
         self.animation_timer += 1
@@ -1023,25 +1837,25 @@ class Player(GameObject):
 
         return self.rect.midbottom
     
-    def check_horizontal_collisions(self, platforms):
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
+    def check_horizontal_collisions(self, level):
+        for rect in level.query_rect(self.rect):
+            if self.rect.colliderect(rect):
                 if self.vel_x > 0:  # Moving right
-                    self.rect.right = platform.rect.left
+                    self.rect.right = rect.left
                     self.vel_x = 0
                 elif self.vel_x < 0:  # Moving left
-                    self.rect.left = platform.rect.right
+                    self.rect.left = rect.right
                     self.vel_x = 0
     
-    def check_vertical_collisions(self, platforms):
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
+    def check_vertical_collisions(self, level):
+        for rect in level.query_rect(self.rect):
+            if self.rect.colliderect(rect):
                 if self.vel_y > 0:  # Falling
-                    self.rect.bottom = platform.rect.top
+                    self.rect.bottom = rect.top
                     self.vel_y = 0
                     self.on_ground = True
                 elif self.vel_y < 0:  # Jumping
-                    self.rect.top = platform.rect.bottom
+                    self.rect.top = rect.bottom
                     self.vel_y = 0
     
     def handle_input(self, keys):
@@ -1122,6 +1936,9 @@ class Player(GameObject):
         return None
 
 class Enemy(GameObject):
+    # Types drawn in either orientation (see update); the rest never mirror
+    MIRRORED_TYPES = ("caterpillar", "scorpion", "beetle", "snail")
+
     def __init__(self, x, y, enemy_type="snail"):
         sizes = {
             "beetle": (70, 50), "scorpion": (80, 60), "bee": (50, 50),
@@ -1134,6 +1951,7 @@ class Enemy(GameObject):
         self.detection_range = 500 # How far the mantis can "see" the hero
         self.is_leaping = False
         self.type = enemy_type
+        self.spawn_id = None  # Index in the level file, set by Level.update_activation
         self.health = 3
         self.animation_timer = 0
         self.current_frame = 0
@@ -1148,83 +1966,93 @@ class Enemy(GameObject):
         self.strike_zone = 60 
         # Initialize as None
         self.frames = None
+        self.frame_bank = None
         self.image = None
 
         # Assign Assets
         if enemy_type == "snail":
-            self.base_image = Assets.create_enemy_snail()
+            self.base_image = AssetCache.get("enemy_snail")
             self.speed = 0.6
         elif enemy_type == "caterpillar":
-            self.frames = Assets.create_enemy_caterpillar()
+            self.frames = AssetCache.get("enemy_caterpillar")
             self.speed = 0.8
         elif enemy_type == "scorpion":
-            self.frames = Assets.create_enemy_scorpion()
+            self.frames = AssetCache.get("enemy_scorpion")
             self.speed = 1.5
         elif enemy_type == "beetle":
-            self.frames = Assets.create_enemy_beetle() # Changed to frames for animation
+            self.frames = AssetCache.get("enemy_beetle") # Changed to frames for animation
             self.health = 10
             self.speed = 0.7
         elif enemy_type == "mantis":
-            self.frames = Assets.create_enemy_mantis()
+            self.frames = AssetCache.get("enemy_mantis")
             self.speed = 0.7  
         elif enemy_type == "spider":
-            self.base_image = Assets.create_enemy_spider()
+            self.base_image = AssetCache.get("enemy_spider")
             self.speed = 1
         elif enemy_type == "bee":
-            self.frames = Assets.create_enemy_bee()
+            self.frames = AssetCache.get("enemy_bee")
             self.speed = 0.8
         else:
             self.speed = 1
     
+        # Both orientations of the sprite, baked once and shared, for the
+        # types that turn around; the others only ever show bank[0]
+        if enemy_type in self.MIRRORED_TYPES:
+            self.frame_bank = AssetCache.get_bank("enemy_" + enemy_type)
+        elif self.frames is not None or enemy_type == "spider":
+            self.frame_bank = (self.frames if self.frames is not None else (self.base_image,),)
+    
         # SAFE CHECK: Assign image from frames ONLY if frames is a list
         if self.frames is not None: 
             self.image = self.frames[0]
+        elif self.frame_bank is not None:
+            self.image = self.base_image
         elif self.image is None:
             # Emergency fallback: magenta square
             self.image = pygame.Surface((width, height))
             self.image.fill((255, 0, 255))
-    def handle_gravity_and_collision(self, platforms):
+    def handle_gravity_and_collision(self, level):
         self.vel_y += GRAVITY
         self.rect.y += self.vel_y
         self.on_ground = False
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
+        for rect in level.query_rect(self.rect):
+            if self.rect.colliderect(rect):
                 if self.vel_y > 0:
-                    self.rect.bottom = platform.rect.top
+                    self.rect.bottom = rect.top
                     self.vel_y = 0
                     self.on_ground = True
                 elif self.vel_y < 0:
-                    self.rect.top = platform.rect.bottom
+                    self.rect.top = rect.bottom
                     self.vel_y = 0
     ###
-    def handle_physics(self, platforms):
+    def handle_physics(self, level):
     # Apply Gravity
         self.vel_y += 0.8 # Gravity constant
     
     # Vertical Movement & Collision
         self.rect.y += self.vel_y
         self.on_ground = False
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
+        for rect in level.query_rect(self.rect):
+            if self.rect.colliderect(rect):
                 if self.vel_y > 0:
-                    self.rect.bottom = platform.rect.top
+                    self.rect.bottom = rect.top
                     self.vel_y = 0
                     self.on_ground = True
                 elif self.vel_y < 0:
-                    self.rect.top = platform.rect.bottom
+                    self.rect.top = rect.bottom
                     self.vel_y = 0
 
     # Horizontal Movement & Collision
         self.rect.x += self.vel_x
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
+        for rect in level.query_rect(self.rect):
+            if self.rect.colliderect(rect):
                 if self.vel_x > 0:
-                    self.rect.right = platform.rect.left
+                    self.rect.right = rect.left
                 elif self.vel_x < 0:
-                    self.rect.left = platform.rect.right
+                    self.rect.left = rect.right
                 self.vel_x = 0 # Stop if hitting a wall
     ###
-    def handle_movement_and_collision(self, platforms):
+    def handle_movement_and_collision(self, level):
         if self.type == "bee":
             self.vel_y = math.sin(pygame.time.get_ticks() * 0.005) * 2
         elif self.type != "spider":
@@ -1234,36 +2062,34 @@ class Enemy(GameObject):
 
         self.rect.y += self.vel_y
         self.on_ground = False
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
+        for rect in level.query_rect(self.rect):
+            if self.rect.colliderect(rect):
                 if self.vel_y > 0:
-                    self.rect.bottom = platform.rect.top
+                    self.rect.bottom = rect.top
                     self.vel_y = 0
                     self.on_ground = True
                 elif self.vel_y < 0:
-                    self.rect.top = platform.rect.bottom
+                    self.rect.top = rect.bottom
                     self.vel_y = 0
 
         self.vel_x = self.move_direction * self.speed
         self.rect.x += self.vel_x
 
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
+        for rect in level.query_rect(self.rect):
+            if self.rect.colliderect(rect):
                 if self.vel_x > 0:
-                    self.rect.right = platform.rect.left
+                    self.rect.right = rect.left
                     self.move_direction = -1
                 elif self.vel_x < 0:
-                    self.rect.left = platform.rect.right
+                    self.rect.left = rect.right
                     self.move_direction = 1
 
         if self.on_ground and self.type not in ["mantis", "bee"]:
             sensor_x = self.rect.right + 10 if self.move_direction > 0 else self.rect.left - 10
-            sensor_rect = pygame.Rect(sensor_x, self.rect.bottom + 5, 2, 2)
-            has_ground_ahead = any(sensor_rect.colliderect(p.rect) for p in platforms)
-            if not has_ground_ahead:
+            if not level.solid_in_area(sensor_x, self.rect.bottom + 5, 2, 2):
                 self.move_direction *= -1
 
-    def update(self, player_rect, platforms, scroll_x, projectiles, game_objects):
+    def update(self, player_rect, level, scroll_x, projectiles, game_objects):
         self.animation_timer += 1
         self.attack_timer += 1
 
@@ -1301,7 +2127,7 @@ class Enemy(GameObject):
                 self.jump_cooldown -= 1
             
         # Physics: Move the Mantis
-            self.handle_physics(platforms)
+            self.handle_physics(level)
             if self.attack_timer % 80 == 0 and dist_abs < 500:
                 return "mantis_fire"
         elif self.type == "bee":
@@ -1311,19 +2137,19 @@ class Enemy(GameObject):
             if abs(self.rect.centerx - player_rect.centerx) < 50 and self.attack_timer % 60 == 0:
                 return "honey"
         elif self.type == "scorpion":
-            self.handle_movement_and_collision(platforms)
+            self.handle_movement_and_collision(level)
             # Fire sting projectile every 100 frames
             if self.attack_timer % 100 == 0:
                 return "scorpion_fire"
         elif self.type == "beetle":
-            self.handle_movement_and_collision(platforms)
+            self.handle_movement_and_collision(level)
             # Fire heavy blast every 140 frames
             if self.attack_timer % 140 == 0:
                 return "beetle_fire"
         
         else:
         # ... keep your other enemies (snail, etc.) as they were ...
-            self.handle_movement_and_collision(platforms)
+            self.handle_movement_and_collision(level)
         
         if self.type in ["beetle"]:
             # Every 30 frames, they "freeze" for a split second, then dash
@@ -1343,45 +2169,36 @@ class Enemy(GameObject):
         else:
             current_speed = self.speed
 
-        self.handle_movement_and_collision(platforms)
+        self.handle_movement_and_collision(level)
         
         
         if self.frames is not None:
             # Cycle animation
             if self.animation_timer % 6 == 0:
                 self.current_frame = (self.current_frame + 1) % len(self.frames)
-            raw_frame = self.frames[self.current_frame]
-        else:
-            # For static enemies like Snail/Spider, we need a base_image reference
-            # If you haven't defined base_image in __init__, use self.image
-            raw_frame = getattr(self, 'base_image', self.image)
+        # Static enemies like Snail/Spider stay on frame 0 of their bank
 
         if self.type in ["caterpillar", "scorpion", "beetle"]:
-            # These are drawn facing RIGHT. Flip if moving LEFT (-1).
-            if self.move_direction == -1:
-                self.image = pygame.transform.flip(raw_frame, True, False)
-            else:
-                self.image = raw_frame
-                
+            # These are drawn facing RIGHT. Mirror if moving LEFT (-1).
+            mirrored = 1 if self.move_direction == -1 else 0
         elif self.type == "snail":
-            # Snail is drawn facing LEFT. Flip if moving RIGHT (1).
-            if self.move_direction == 1:
-                self.image = pygame.transform.flip(raw_frame, True, False)
-            else:
-                self.image = raw_frame
-        
+            # Snail is drawn facing LEFT. Mirror if moving RIGHT (1).
+            mirrored = 1 if self.move_direction == 1 else 0
         else:
             # Bee, Mantis, Spider: Do not flip, use raw frame directly
-            self.image = raw_frame
+            mirrored = 0
+
+        if self.frame_bank is not None:
+            self.image = self.frame_bank[mirrored][self.current_frame]
 
         # 4. Special Attacks (Caterpillar trails, etc.)
         if self.type == "caterpillar":
-            self.handle_movement_and_collision(platforms)
+            self.handle_movement_and_collision(level)
             if self.animation_timer % 60 == 0:
                 return "sticky"
         
         else:
-            self.handle_movement_and_collision(platforms)
+            self.handle_movement_and_collision(level)
                 
         return None
      
@@ -1391,10 +2208,228 @@ class Enemy(GameObject):
         return self.health <= 0
 
 
+class EnemySwarm:
+    """Structure-of-arrays engine for the ground-walking enemy types.
+    
+    Every field is a NumPy array with one entry per swarm enemy. Gravity,
+    patrol moves, ledge sensing, timers and attack cadence are stepped for
+    all of them at once; only enemies that touch something other than flat
+    ground drop to the same per-rect collision code Enemy uses. Enabled by
+    --enemy-swarm (see Level.use_enemy_swarm).
+    Shots and trails come back from update() for Game to spawn.
+    """
+    TYPES = ("snail", "caterpillar", "spider", "scorpion", "beetle")
+    SNAIL, CATERPILLAR, SPIDER, SCORPION, BEETLE = range(5)
+    FIELDS = [
+        ("x", "i8"), ("y", "i8"), ("w", "i8"), ("h", "i8"), ("vel_y", "f8"),
+        ("speed", "f8"), ("direction", "i8"), ("type_id", "i8"), ("health", "i8"),
+        ("animation_timer", "i8"), ("attack_timer", "i8"), ("current_frame", "i8"),
+        ("on_ground", "?"), ("spawn_id", "i8"),
+    ]
+    
+    def __init__(self, level):
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(0, dtype))
+        self.level = level
+        # Per-type values, read off one Enemy of each type as the type first spawns
+        self.prototypes = [None] * len(self.TYPES)
+        self.banks = [None] * len(self.TYPES)
+        # Animated types cycle frames; 0 marks the single-frame ones
+        self.frame_counts = np.zeros(len(self.TYPES), np.int64)
+    
+    def prototype(self, type_id):
+        enemy = self.prototypes[type_id]
+        if enemy is None:
+            enemy = self.prototypes[type_id] = Enemy(0, 0, self.TYPES[type_id])
+            self.banks[type_id] = enemy.frame_bank
+            self.frame_counts[type_id] = len(enemy.frames) if enemy.frames is not None else 0
+        return enemy
+    
+    def __len__(self):
+        return len(self.x)
+    
+    def add(self, records):
+        """Append enemies given as (x, y, type, health, spawn id) spawn records"""
+        if not records:
+            return
+        columns = {name: [] for name, dtype in self.FIELDS}
+        for x, y, enemy_type, health, spawn_id in records:
+            type_id = self.TYPES.index(enemy_type)
+            prototype = self.prototype(type_id)
+            values = {
+                "x": x, "y": y, "w": prototype.rect.width, "h": prototype.rect.height, "vel_y": 0.0,
+                "speed": prototype.speed, "direction": random.choice([-1, 1]),
+                "type_id": type_id, "health": prototype.health if health is None else health,
+                "animation_timer": 0, "attack_timer": 0, "current_frame": 0,
+                "on_ground": False, "spawn_id": spawn_id,
+            }
+            for name, value in values.items():
+                columns[name].append(value)
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.concatenate([getattr(self, name), np.array(columns[name], dtype)]))
+    
+    def keep(self, mask):
+        """Drop every enemy whose entry in mask is False"""
+        for name, dtype in self.FIELDS:
+            setattr(self, name, getattr(self, name)[mask])
+    
+    def retire(self, left, right):
+        """Remove the enemies wholly outside [left, right]; returns their spawn records"""
+        out = (self.x + self.w < left) | (self.x > right)
+        records = [(int(self.x[i]), int(self.y[i]), self.TYPES[self.type_id[i]],
+                    int(self.health[i]), int(self.spawn_id[i])) for i in np.flatnonzero(out)]
+        if records:
+            self.keep(~out)
+        return records
+    
+    def rect(self, i):
+        return pygame.Rect(int(self.x[i]), int(self.y[i]), int(self.w[i]), int(self.h[i]))
+    
+    def overlapping(self, rect):
+        """Indices of the enemies overlapping rect"""
+        return np.flatnonzero((self.x < rect.right) & (rect.left < self.x + self.w)
+                              & (self.y < rect.bottom) & (rect.top < self.y + self.h))
+    
+    def update(self):
+        """Advance every swarm enemy one frame, as Enemy.update would.
+        
+        Returns (indices, event) pairs for the spawn side effects: "sticky"
+        trails and "scorpion_fire"/"beetle_fire" shots.
+        """
+        if not len(self):
+            return []
+        self.animation_timer += 1
+        self.attack_timer += 1
+        type_id = self.type_id
+        
+        # Scorpions and beetles return from Enemy.update as soon as they fire,
+        # after one movement pass instead of three and without animating
+        scorpion_fire = (type_id == self.SCORPION) & (self.attack_timer % 100 == 0)
+        beetle_fire = (type_id == self.BEETLE) & (self.attack_timer % 140 == 0)
+        full = ~(scorpion_fire | beetle_fire)
+        
+        everyone = np.arange(len(self))
+        self.move(everyone)
+        rest = np.flatnonzero(full)
+        self.move(rest)
+        frame_counts = self.frame_counts[type_id]
+        animate = full & (frame_counts > 0) & (self.animation_timer % 6 == 0)
+        self.current_frame = np.where(animate, (self.current_frame + 1) % np.maximum(frame_counts, 1),
+                                      self.current_frame)
+        self.move(rest)
+        
+        sticky = full & (type_id == self.CATERPILLAR) & (self.animation_timer % 60 == 0)
+        return [(np.flatnonzero(sticky), "sticky"),
+                (np.flatnonzero(scorpion_fire), "scorpion_fire"),
+                (np.flatnonzero(beetle_fire), "beetle_fire")]
+    
+    def move(self, idx):
+        """One Enemy.handle_movement_and_collision() pass for the enemies in idx"""
+        if not len(idx):
+            return
+        level = self.level
+        size = level.TILE_SIZE
+        x, y, w, h = self.x[idx], self.y[idx], self.w[idx], self.h[idx]
+        
+        # Gravity (spiders cling where they are) and the vertical move
+        vel_y = np.where(self.type_id[idx] == self.SPIDER, 0.0, self.vel_y[idx] + GRAVITY)
+        y_moved = GameObject.rect_round(y + vel_y)
+        bottom = y_moved + h
+        on_ground = np.zeros(len(idx), bool)
+        solid = level.solid_cells(x, y_moved, x + w, bottom)
+        on_platform = level.platform_cells(x, y_moved, x + w, bottom)
+        # Fast path: falling into the top row of grid tiles only lands on that row
+        ground_top = (bottom - 1) // size * size
+        landed = (solid & ~on_platform & (vel_y > 0) & (y_moved < ground_top)
+                  & ~level.solid_cells(x, y_moved, x + w, ground_top))
+        y_moved = np.where(landed, ground_top - h, y_moved)
+        vel_y = np.where(landed, 0.0, vel_y)
+        on_ground |= landed
+        for j in np.flatnonzero((solid | on_platform) & ~landed):
+            rect = pygame.Rect(int(x[j]), int(y_moved[j]), int(w[j]), int(h[j]))
+            for collider in level.query_rect(rect):
+                if rect.colliderect(collider):
+                    if vel_y[j] > 0:
+                        rect.bottom = collider.top
+                        vel_y[j] = 0
+                        on_ground[j] = True
+                    elif vel_y[j] < 0:
+                        rect.top = collider.bottom
+                        vel_y[j] = 0
+            y_moved[j] = rect.y
+        
+        # Patrol move, turning around at walls
+        direction = self.direction[idx]
+        vel_x = direction * self.speed[idx]
+        x_moved = GameObject.rect_round(x + vel_x)
+        blocked = (level.solid_cells(x_moved, y_moved, x_moved + w, y_moved + h)
+                   | level.platform_cells(x_moved, y_moved, x_moved + w, y_moved + h))
+        for j in np.flatnonzero(blocked):
+            rect = pygame.Rect(int(x_moved[j]), int(y_moved[j]), int(w[j]), int(h[j]))
+            for collider in level.query_rect(rect):
+                if rect.colliderect(collider):
+                    if vel_x[j] > 0:
+                        rect.right = collider.left
+                        direction[j] = -1
+                    elif vel_x[j] < 0:
+                        rect.left = collider.right
+                        direction[j] = 1
+            x_moved[j] = rect.x
+        
+        # Ledge sensor: turn around rather than walk off the edge
+        sensor_x = np.where(direction > 0, x_moved + w + 10, x_moved - 10)
+        sensor_y = y_moved + h + 5
+        ground_ahead = (level.solid_cells(sensor_x, sensor_y, sensor_x + 2, sensor_y + 2)
+                        | level.platform_cells(sensor_x, sensor_y, sensor_x + 2, sensor_y + 2))
+        direction = np.where(on_ground & ~ground_ahead, -direction, direction)
+        
+        self.x[idx] = x_moved
+        self.y[idx] = y_moved
+        self.vel_y[idx] = vel_y
+        self.on_ground[idx] = on_ground
+        self.direction[idx] = direction
+    
+    def carry(self, platform, dx):
+        """Shift the enemies standing on a moving platform by its dx"""
+        rect = platform.rect
+        left = rect.left - dx
+        riders = np.flatnonzero((self.vel_y >= 0) & (self.y + self.h == rect.top)
+                                & (self.x + self.w > left) & (self.x < left + rect.width))
+        for i in riders:
+            rider = self.rect(i)
+            self.level.carry(rider, dx, rect)
+            self.x[i] = rider.x
+    
+    def images(self, indices):
+        """The sprite each enemy in indices shows, picked like Enemy.update does"""
+        images = []
+        for type_id, direction, frame in zip(self.type_id[indices].tolist(), self.direction[indices].tolist(),
+                                             self.current_frame[indices].tolist()):
+            if type_id in (self.CATERPILLAR, self.SCORPION, self.BEETLE):
+                # Drawn facing right: mirror when moving left
+                mirrored = 1 if direction == -1 else 0
+            elif type_id == self.SNAIL:
+                # Drawn facing left: mirror when moving right
+                mirrored = 1 if direction == 1 else 0
+            else:
+                mirrored = 0
+            images.append(self.banks[type_id][mirrored][frame])
+        return images
+    
+    def draw(self, screen, scroll_x):
+        visible = np.flatnonzero((self.x + self.w > scroll_x - 100) & (self.x < scroll_x + SCREEN_WIDTH + 100))
+        if not len(visible):
+            return
+        screen.blits([(image, (x - scroll_x, y))
+                      for image, x, y in zip(self.images(visible), self.x[visible].tolist(), self.y[visible].tolist())],
+                     doreturn=False)
+
+
 class Boss(GameObject):
     def __init__(self, x, y):
         super().__init__(x, y, 250, 200)
-        self.frames = Assets.create_boss()
+        self.frames = AssetCache.get("boss")
+        self.flash_frames = AssetCache.get_flash("boss")
         self.current_frame = 0
         self.animation_timer = 0
         
@@ -1411,6 +2446,11 @@ class Boss(GameObject):
         self.animation_timer += 1
         if self.animation_timer % 3 == 0:
             self.current_frame = (self.current_frame + 1) % len(self.frames)
+        
+        # Flash while invincible after a hit
+        if self.invincible_timer > 0 and self.invincible_timer % 4 < 2:
+            self.image = self.flash_frames[self.current_frame]
+        else:
             self.image = self.frames[self.current_frame]
         
         # Float up and down
@@ -1480,6 +2520,11 @@ class Boss(GameObject):
         return False
 
 class Projectile(GameObject):
+    """One shot as it is fired: size, speed and sprite for its side.
+    
+    Callers adjust vel_x, vel_y, image and slow_effect and hand it to the
+    game's ProjectilePool, which runs it from then on.
+    """
     def __init__(self, x, y, direction, is_player=True, damage=1):
         size = (25, 12) if is_player else (12, 12)
         super().__init__(x, y, size[0], size[1])
@@ -1489,54 +2534,187 @@ class Projectile(GameObject):
         self.direction = direction
         self.vel_x = direction * (5 if is_player else 6)
         self.vel_y = 0
-        self.image = Assets.create_projectile(is_player)
         self.slow_effect = False  # For web projectiles
         
         if not is_player:
-            self.image = pygame.Surface((size[0], size[1]), pygame.SRCALPHA)
-            proj_color = (255, 100, 0) # Default orange
-            pygame.draw.circle(self.image, proj_color, (8, 8), 8)
-            # Add a little glow
-            pygame.draw.circle(self.image, (255, 255, 255, 150), (8, 8), 4)
+            self.image = AssetCache.get("enemy_projectile", "orb")
         else:
-            self.image = Assets.create_projectile(True)
-    def update(self, scroll_x):
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-        
-        # Remove if off screen
-        screen_left = scroll_x - 500
-        screen_right = scroll_x + SCREEN_WIDTH + 100
-       
-        if (self.rect.right < screen_left or 
-            self.rect.left > screen_right or
-            self.rect.top > SCREEN_HEIGHT + 100 or
-            self.rect.bottom < -100):
-            return False
-        
-        return True
+            self.image = AssetCache.get("projectile", True)
+
+
+class ProjectilePool:
+    """Every shot in flight as parallel NumPy arrays.
+    
+    append()/extend() copy fired Projectiles into free slots. step() moves
+    them all and kills the ones that leave the window or hit a wall; the
+    hit tests take whole target sets at once. Spent shots keep their slot
+    (alive False) until compact() runs at the end of the frame.
+    """
+    FIELDS = [
+        ("x", "i8"), ("y", "i8"), ("w", "i8"), ("h", "i8"), ("vel_x", "f8"), ("vel_y", "f8"),
+        ("damage", "i8"), ("is_player", "?"), ("slow_effect", "?"), ("image", "i8"), ("alive", "?"),
+    ]
+    SUBSTEPS = 2  # Moves per frame (shots always covered their velocity twice a frame)
+    
+    def __init__(self, capacity=64):
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype))
+        self.count = 0
+        # Sprites referenced by the image field
+        self.images = []
+        self.image_ids = {}
+    
+    def __len__(self):
+        return self.count
+    
+    def append(self, projectile):
+        if self.count == len(self.x):
+            for name, dtype in self.FIELDS:
+                values = getattr(self, name)
+                setattr(self, name, np.concatenate([values, np.zeros_like(values)]))
+        image_id = self.image_ids.get(projectile.image)
+        if image_id is None:
+            image_id = self.image_ids[projectile.image] = len(self.images)
+            self.images.append(projectile.image)
+        i = self.count
+        self.x[i], self.y[i], self.w[i], self.h[i] = projectile.rect
+        self.vel_x[i] = projectile.vel_x
+        self.vel_y[i] = projectile.vel_y
+        self.damage[i] = projectile.damage
+        self.is_player[i] = projectile.is_player
+        self.slow_effect[i] = projectile.slow_effect
+        self.image[i] = image_id
+        self.alive[i] = True
+        self.count += 1
+    
+    def extend(self, projectiles):
+        for projectile in projectiles:
+            self.append(projectile)
+    
+    def rect(self, i):
+        return pygame.Rect(int(self.x[i]), int(self.y[i]), int(self.w[i]), int(self.h[i]))
+    
+    def step(self, level, scroll_x):
+        """Move every live shot for one frame; returns the indices of the
+        shots that hit a wall, which are now dead"""
+        n = self.count
+        walled = []
+        for _ in range(self.SUBSTEPS):
+            live = np.flatnonzero(self.alive[:n])
+            if not len(live):
+                break
+            x = GameObject.rect_round(self.x[live] + self.vel_x[live])
+            y = GameObject.rect_round(self.y[live] + self.vel_y[live])
+            self.x[live] = x
+            self.y[live] = y
+            right = x + self.w[live]
+            bottom = y + self.h[live]
+            off_screen = ((right < scroll_x - 500) | (x > scroll_x + SCREEN_WIDTH + 100)
+                          | (y > SCREEN_HEIGHT + 100) | (bottom < -100))
+            hit = ~off_screen & (level.solid_cells(x, y, right, bottom) | level.platform_cells(x, y, right, bottom))
+            self.alive[live[off_screen | hit]] = False
+            walled.append(live[hit])
+        return np.concatenate(walled).tolist() if walled else []
+    
+    def hits(self, left, top, right, bottom, is_player):
+        """(target, shot) index pairs, in target then shot order, for the live
+        shots of one side overlapping each target area [left, right) x [top, bottom)"""
+        n = self.count
+        shots = np.flatnonzero(self.alive[:n] & (self.is_player[:n] == is_player))
+        if not len(shots) or not len(left):
+            return []
+        x, y = self.x[shots], self.y[shots]
+        shot_right, shot_bottom = x + self.w[shots], y + self.h[shots]
+        # Only targets within the shots' horizontal extent go into the matrix
+        targets = np.flatnonzero((left < shot_right.max()) & (right > x.min()))
+        if not len(targets):
+            return []
+        overlap = ((left[targets, None] < shot_right) & (x < right[targets, None])
+                   & (top[targets, None] < shot_bottom) & (y < bottom[targets, None]))
+        rows, columns = np.nonzero(overlap)
+        return list(zip(targets[rows].tolist(), shots[columns].tolist()))
+    
+    def overlapping(self, rect, is_player):
+        """Indices of the live shots of one side overlapping rect"""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        return np.flatnonzero(self.alive[:n] & (self.is_player[:n] == is_player)
+                              & (x < rect.right) & (rect.left < x + self.w[:n])
+                              & (y < rect.bottom) & (rect.top < y + self.h[:n])).tolist()
+    
+    def spend(self, i):
+        """Kill shot i as it lands; returns its damage"""
+        self.alive[i] = False
+        return int(self.damage[i])
+    
+    def compact(self):
+        """Close up the slots of dead shots, keeping the firing order"""
+        n = self.count
+        live = np.flatnonzero(self.alive[:n])
+        if len(live) == n:
+            return
+        for name, dtype in self.FIELDS:
+            values = getattr(self, name)
+            values[:len(live)] = values[live]
+        self.alive[len(live):n] = False
+        self.count = len(live)
+    
+    def draw(self, screen, scroll_x):
+        n = self.count
+        live = np.flatnonzero(self.alive[:n])
+        images = self.images
+        screen.blits([(images[image], (x - scroll_x, y))
+                      for image, x, y in zip(self.image[live].tolist(), self.x[live].tolist(),
+                                             self.y[live].tolist())],
+                     doreturn=False)
 
 
 class Platform(GameObject):
+    # Index into the shared tiles from Assets.create_platform_tiles()
+    TILE_VARIANTS = {"ground": 0, "bare": 1, "moving": 2, "breakable": 3}
+
     def __init__(self, x, y, width=64, height=64, platform_type="ground"):
         super().__init__(x, y, width, height)
         self.platform_type = platform_type
-        self.image = Assets.create_tile(platform_type == "ground")
-        
-        # Different colors for different platforms
-        if platform_type == "moving":
-            self.image.fill((100, 70, 30))
-        elif platform_type == "breakable":
-            self.image.fill((150, 100, 50))
-            pygame.draw.rect(self.image, (100, 60, 30), (0, 0, 64, 64), 4)
+        # Flyweight: every platform shares one of a handful of tiles
+        self.tile_index = Platform.TILE_VARIANTS.get(platform_type, 1)
+        self.image = AssetCache.get("platform_tiles")[self.tile_index]
+
+class MovingPlatform(Platform):
+    """Platform sliding back and forth around its start x.
+
+    update() records the frame's displacement in dx so Level can carry
+    whatever is standing on the platform along with it.
+    """
+    def __init__(self, x, y, move_speed=2, move_range=200):
+        super().__init__(x, y, platform_type="moving")
+        self.move_direction = 1
+        self.move_speed = move_speed
+        self.move_range = move_range
+        self.start_x = x
+        self.dx = 0
+    
+    def update(self):
+        self.dx = self.move_speed * self.move_direction
+        self.rect.x += self.dx
+        if abs(self.rect.x - self.start_x) > self.move_range:
+            self.move_direction *= -1
+        return self.dx
+    
+    def carries(self, rect):
+        """Whether rect was standing on the platform before this frame's move"""
+        top = self.rect.top
+        left = self.rect.left - self.dx
+        return rect.bottom == top and rect.right > left and rect.left < left + self.rect.width
 
 class Powerup(GameObject):
     def __init__(self, x, y, type="weapon"):
         super().__init__(x, y, 40, 40)
         self.type = type
-        self.image = Assets.create_powerup(type)
+        self.image = AssetCache.get("powerup", type)
         self.float_offset = random.random() * math.pi * 2
         self.collected = False
+        self.powerup_id = None  # Index in the level file, set by Level.load_band
     
     def update(self):
         self.float_offset += 0.1
@@ -1557,10 +2735,364 @@ class StickyTrail(GameObject):
             bubble_size = random.randint(2, 4)
             pygame.draw.circle(self.surf, (150, 130, 80, 150), 
                              (bubble_x, bubble_y), bubble_size)
+        self.surf = AssetCache.to_display_format(self.surf)
     
     def update(self):
         self.lifetime -= 1
         return self.lifetime > 0
+
+# ================= SPATIAL HASH =================
+class SpatialHash:
+    """Uniform grid of buckets over collision rects.
+
+    query_rect() only looks at the buckets a rect touches, so collision cost
+    does not grow with the level length. Only static rects go in (moving
+    platforms are checked separately by Level.query_rect). Indices only ever
+    increase, so removed rects leave no holes to reuse.
+    """
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self.rects = {}
+        self.spans = {}  # (cx0, cy0, cx1, cy1) cell span per rect
+        self.buckets = {}
+        self.next_index = 0
+
+    def span(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _cells(self, span):
+        cx0, cy0, cx1, cy1 = span
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def insert(self, rect):
+        index = self.next_index
+        self.next_index += 1
+        span = self.span(rect)
+        self.rects[index] = rect
+        self.spans[index] = span
+        for cell in self._cells(span):
+            self.buckets.setdefault(cell, []).append(index)
+        return index
+
+    def remove(self, index):
+        for cell in self._cells(self.spans.pop(index)):
+            bucket = self.buckets[cell]
+            bucket.remove(index)
+            if not bucket:
+                del self.buckets[cell]
+        del self.rects[index]
+
+    def query_rect(self, rect):
+        """Rects sharing a bucket with rect, in insertion order.
+
+        Insertion order keeps collision resolution identical to a linear scan.
+        """
+        span = self.span(rect)
+        if span[0] == span[2] and span[1] == span[3]:
+            # Common case: an entity inside a single cell
+            bucket = self.buckets.get(span[:2])
+            return [self.rects[index] for index in bucket] if bucket else []
+        found = set()
+        for cell in self._cells(span):
+            bucket = self.buckets.get(cell)
+            if bucket:
+                found.update(bucket)
+        return [self.rects[index] for index in sorted(found)]
+
+# ================= LEVEL STORE =================
+class CompiledLevel:
+    """A compiled level, read straight out of its (memory-mapped) buffer.
+
+    tiles is column-major, one byte per cell (0 empty, 1 + index into
+    Level.SOLID_GLYPHS otherwise), so a band of columns is one contiguous
+    slice. The spawn and powerup tables hold (code, col, row) records sorted
+    by column; they are searched per band and never decoded whole.
+    """
+    def __init__(self, data, stamp, rows, cols, length, n_spawns, n_powerups,
+                 spawn_mask, powerup_mask):
+        self.data = data
+        self.stamp = stamp
+        self.rows = rows
+        self.cols = cols
+        self.length = length
+        view = memoryview(data)
+        offset = LevelStore.HEADER.size
+        self.tiles = view[offset:offset + cols * rows]
+        offset += cols * rows
+        self.spawn_table = view[offset:offset + n_spawns * LevelStore.RECORD.size]
+        offset += n_spawns * LevelStore.RECORD.size
+        self.powerup_table = view[offset:offset + n_powerups * LevelStore.RECORD.size]
+        self.spawn_types = {name for code, name in enumerate(Level.SPAWN_TYPES) if spawn_mask >> code & 1}
+        self.powerup_types = {name for code, name in enumerate(Level.POWERUP_TYPES) if powerup_mask >> code & 1}
+        self._solid_grid = None
+
+    def solid_grid(self):
+        """The tiles as a NumPy bool array indexed [column + 1, row + 1] for
+        the batched tests, built on first use and shared by every Level made
+        from this compiled level; the empty border stands in for everything
+        outside"""
+        if self._solid_grid is None:
+            self._solid_grid = np.pad(np.frombuffer(self.tiles, np.uint8).reshape(self.cols, self.rows) != 0, 1)
+        return self._solid_grid
+
+    @staticmethod
+    def _records(table, first_col, end_col):
+        record = LevelStore.RECORD
+        count = len(table) // record.size
+        # Binary search for the first record at or after first_col
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if record.unpack_from(table, mid * record.size)[1] < first_col:
+                lo = mid + 1
+            else:
+                hi = mid
+        records = []
+        for index in range(lo, count):
+            code, col, row = record.unpack_from(table, index * record.size)
+            if col >= end_col:
+                break
+            records.append((index, code, col, row))
+        return records
+
+    def spawns_in(self, first_col, end_col):
+        """(index, code, col, row) spawn records with first_col <= col < end_col"""
+        return self._records(self.spawn_table, first_col, end_col)
+
+    def powerups_in(self, first_col, end_col):
+        return self._records(self.powerup_table, first_col, end_col)
+
+
+class LevelStore:
+    """Compiles level text files into a compact binary, cached on disk.
+
+    A level file holds optional "# comment" and "key: value" lines (only
+    "length", the level length in pixels, is read) followed by the grid rows.
+    The compiled file is HEADER, the tile array, then the spawn and powerup
+    records. The header carries the source's mtime and size, so editing a
+    level recompiles it on the next load without re-reading the text.
+    Compiled files are memory-mapped: loading one only reads the header, and
+    Level pulls in bands of columns as the camera reaches them.
+    """
+    VERSION = 2
+    MAGIC = b"TLVL"
+    # magic, version, rows, cols, length, spawn / powerup counts,
+    # spawn / powerup type bitmasks, source mtime and size
+    HEADER = struct.Struct("<4sHHIIIIHHqq")
+    RECORD = struct.Struct("<BIH")  # code, col, row
+
+    def __init__(self, path):
+        self.path = path
+        self.levels = {}
+
+    @staticmethod
+    def source_stamp(source_path):
+        stat = os.stat(source_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def read_source(source_path):
+        """Grid rows and metadata of a level text file"""
+        rows = []
+        metadata = {}
+        with open(source_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\r\n")
+                if not rows and line.startswith("#"):
+                    continue
+                if not rows and ":" in line:
+                    key, value = line.split(":", 1)
+                    metadata[key.strip()] = value.strip()
+                    continue
+                rows.append(line)
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows, metadata
+
+    @classmethod
+    def compile(cls, source_path, stamp):
+        level_data, metadata = cls.read_source(source_path)
+        rows = len(level_data)
+        cols = max(len(row) for row in level_data)
+        length = int(metadata.get("length", cols * Level.TILE_SIZE))
+
+        tiles = bytearray(cols * rows)
+        spawns = []
+        powerups = []
+        for y, row in enumerate(level_data):
+            for x, char in enumerate(row):
+                if char in Level.SOLID_GLYPHS:
+                    tiles[x * rows + y] = 1 + Level.SOLID_GLYPHS.index(char)
+                elif char in Level.ENEMY_GLYPHS:
+                    spawns.append((x, y, Level.SPAWN_TYPES.index(Level.ENEMY_GLYPHS[char])))
+                elif char == Level.BOSS_GLYPH:
+                    spawns.append((x, y, Level.SPAWN_TYPES.index("boss")))
+                elif char in Level.POWERUP_GLYPHS:
+                    powerups.append((x, y, Level.POWERUP_TYPES.index(Level.POWERUP_GLYPHS[char])))
+        spawns.sort()
+        powerups.sort()
+        spawn_mask = 0
+        for x, y, code in spawns:
+            spawn_mask |= 1 << code
+        powerup_mask = 0
+        for x, y, code in powerups:
+            powerup_mask |= 1 << code
+
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, rows, cols, length,
+                                 len(spawns), len(powerups), spawn_mask, powerup_mask, *stamp)
+        records = [cls.RECORD.pack(code, x, y) for x, y, code in spawns + powerups]
+        return b"".join([header, bytes(tiles)] + records)
+
+    def parse(self, data, stamp):
+        """CompiledLevel over a compiled buffer, or None if it is stale or foreign"""
+        if len(data) < self.HEADER.size:
+            return None
+        (magic, version, rows, cols, length, n_spawns, n_powerups,
+         spawn_mask, powerup_mask, mtime, size) = self.HEADER.unpack_from(data)
+        expected = self.HEADER.size + cols * rows + (n_spawns + n_powerups) * self.RECORD.size
+        if (magic != self.MAGIC or version != self.VERSION
+                or (mtime, size) != stamp or len(data) != expected):
+            return None
+        return CompiledLevel(data, stamp, rows, cols, length, n_spawns, n_powerups,
+                             spawn_mask, powerup_mask)
+
+    def load(self, source_path):
+        stamp = self.source_stamp(source_path)
+        compiled = self.levels.get(source_path)
+        if compiled is not None and compiled.stamp == stamp:
+            return compiled
+
+        name = os.path.splitext(os.path.basename(source_path))[0]
+        file_path = os.path.join(self.path, name + ".bin")
+        try:
+            with open(file_path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            compiled = self.parse(data, stamp)
+        except (OSError, ValueError):
+            compiled = None
+
+        if compiled is None:
+            data = self.compile(source_path, stamp)
+            # Writing the cache is best effort: when it fails the level runs
+            # from the compiled bytes in memory and compiles again next launch
+            try:
+                os.makedirs(self.path, exist_ok=True)
+                tmp_path = file_path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, file_path)
+            except OSError:
+                pass
+            compiled = self.parse(data, stamp)
+
+        self.levels[source_path] = compiled
+        return compiled
+
+
+class LevelBand:
+    """The live objects of one loaded band of level columns"""
+    def __init__(self):
+        self.platforms = []
+        self.colliders = []
+        self.collider_indices = []
+        self.powerups = []
+        self.chunk = None
+
+
+class BackgroundObjects:
+    """Decorative background objects as typed arrays sorted by x.
+    
+    Object i is TYPES[types[i]] with its base at (xs[i], ys[i]); sizes[i] is
+    its size (a forest tree's height). span() bisects xs for a range.
+    """
+    TYPES = ('tree', 'forest_tree', 'stalactite', 'stalagmite')
+    
+    def __init__(self, records=()):
+        # records are (type name, x, y, size)
+        records = sorted(records, key=lambda record: record[1])
+        self.types = array('B', [self.TYPES.index(record[0]) for record in records])
+        self.xs = array('i', [record[1] for record in records])
+        self.ys = array('i', [record[2] for record in records])
+        self.sizes = array('H', [record[3] for record in records])
+    
+    def __len__(self):
+        return len(self.xs)
+    
+    def span(self, left, right):
+        """Index range of the objects with left <= x < right"""
+        return bisect.bisect_left(self.xs, left), bisect.bisect_left(self.xs, right)
+
+
+class ParallaxLayer:
+    """Background objects of some types, scrolled at factor × the camera.
+    
+    The objects are drawn into STRIP_WIDTH-wide strips as the strips come
+    into view, and strips well off screen are dropped again, so a frame is a
+    single blits() call however many objects the layer holds. The last few
+    dropped strips are kept aside, so scrolling back does not draw them again.
+    """
+    STRIP_WIDTH = 1024
+    # An object is drawn into every strip within REACH of its x
+    REACH = 100
+    # Dropped strips kept for scrolling back (each is at most 1024 x 600 pixels)
+    RECENT_STRIPS = 4
+    
+    def __init__(self, objects, types, factor):
+        self.objects = objects
+        self.type_ids = {BackgroundObjects.TYPES.index(name) for name in types}
+        self.factor = factor
+        self.strips = {}  # strip index -> (x, y, surface) in layer coordinates, or None if empty
+        self.recent = {}  # Dropped strips, same shape, least recently dropped first
+        self.rendered = 0  # Strips drawn so far
+    
+    def draw(self, screen, scroll_x):
+        offset = int(scroll_x * self.factor)
+        first = offset // self.STRIP_WIDTH
+        last = (offset + SCREEN_WIDTH - 1) // self.STRIP_WIDTH
+        for index in [index for index in self.strips if index < first - 1 or index > last + 1]:
+            self.recent[index] = self.strips.pop(index)
+            if len(self.recent) > self.RECENT_STRIPS:
+                del self.recent[next(iter(self.recent))]
+        blits = []
+        for index in range(first, last + 1):
+            if index in self.recent:
+                self.strips[index] = self.recent.pop(index)
+            elif index not in self.strips:
+                self.strips[index] = self.render_strip(index)
+                self.rendered += 1
+            strip = self.strips[index]
+            if strip:
+                x, y, surface = strip
+                blits.append((surface, (x - offset, y)))
+        screen.blits(blits, doreturn=False)
+    
+    def render_strip(self, index):
+        objects = self.objects
+        strip_x = index * self.STRIP_WIDTH
+        start, end = objects.span(strip_x - self.REACH, strip_x + self.STRIP_WIDTH + self.REACH)
+        members = [(BackgroundObjects.TYPES[objects.types[i]], objects.xs[i], objects.ys[i], objects.sizes[i])
+                   for i in range(start, end) if objects.types[i] in self.type_ids]
+        if not members:
+            return None
+        # Only as tall as the rows the members can cover
+        extents = [Level.background_object_extent(object_type, y, size)
+                   for object_type, x, y, size in members]
+        top = max(min(extent[0] for extent in extents), 0)
+        bottom = min(max(extent[1] for extent in extents), SCREEN_HEIGHT)
+        if bottom <= top:
+            return None
+        strip = pygame.Surface((self.STRIP_WIDTH, bottom - top))
+        strip.fill(Level.CHUNK_COLORKEY)
+        for object_type, x, y, size in members:
+            Level.draw_background_object(strip, object_type, x - strip_x, y - top, size)
+        strip = AssetCache.to_display_format(strip)
+        strip.set_colorkey(Level.CHUNK_COLORKEY, pygame.RLEACCEL)
+        return strip_x, top, strip
+
 '''
 S: Spider (Shoots slowing webs) ......
 M: Mantis (Performs leaping ninja attacks) ......
@@ -1572,108 +3104,129 @@ B: bee
 D: Cyborg Queen
 '''
 class Level:
-    LEVELS = [
-
-# ==================================================
-# HORIZONTAL LEVEL 1 – GRASSLAND FLOW
-# ==================================================
-[
-"..................................................................................................................................",
-".......................................................................................................................................",
-"...............................................................................X........S.....X..........X.....X....................",
-".............................XXX...................XS..............X......................X...X...........X.....X.................",
-"........................P..................P...................X.......................B.......................X.................",
-".......................P.....N........S...P...............X..................................XH...............X.......................",
-"............................PP.....X.PP............H.N....................B...............X...X..............X.......................",
-"...............PP.........................P........XXX......P.................K......S...X......SX..........X............................",
-"................P.......P................NP..................................XXXX............X...X.........X...........................",
-"...........N.X..P...N..P.....C...W.X.X..XP.....C....M.....X....H..............C.............X....X....M.M.X.H....C.................",
-"XXXXXXXXXXXXXXX.X..XXXXXXXXXXXXXXX.........XXXXXXXXXXXXXXXXXX..X........X..XXXXXXXX..XXXXXXXX.....XXXXXXXXXXXXXXXXXXX.X.X.X.X.X.X.X.XXXXXXX",
-"................................................................................................",
-],
-
-# ==================================================
-# HORIZONTAL LEVEL 2 – ENEMY RHYTHM
-# ==================================================
-[
-"................................................................................................",
-".............Q.................Q.................Q.................Q..........................",
-".............P.................P.................P.................P..........................",
-".............P.................P.................P.................P..........................",
-"..................C..................C..................C..................C................",
-".............P.................P.................P.................P..........................",
-"..................C..................C..................C..................C................",
-"....E.................E.................E.................E.................E................",
-"XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXX",
-"XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
-],
-
-# ==================================================
-# HORIZONTAL LEVEL 3 – PIPES & PRESSURE
-# ==================================================
-[
-"................................................................................................",
-".............Q.................Q.................Q.................Q..........................",
-".............P.................P.................P.................P..........................",
-"................................................................................................",
-".............Q.................Q.................Q.................Q..........................",
-".............P.................P.................P.................P..........................",
-"..................C..................C..................C..................C................",
-"....T...Q..E..............T......E..............T......E..............T......E..............",
-"XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXX",
-"XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXXXX..XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
-],
-
-# ==================================================
-# HORIZONTAL LEVEL 4 – LAVA BUT FAIR
-# ==================================================
-[
-"................................................................................................",
-".............Q.................Q.................Q.................Q..........................",
-".............P.................P.................P.................P..........................",
-"..................C..................C..................C..................C................",
-"....E.................E.................E.................E.................E................",
-"...................................................................................................",
-"...................................................................................................",
-"...................................................................................................",
-"...................................................................................................",
-"...................................................................................................",
-"XXXXXXXX....XXXXXXXX..L..XXXXXXXX..L..XXXXXXXX..L..XXXXXXXX..L..XXXXXXXX..L..XXXXXXXX..L..XXXX",
-"XXXXXXXX....XXXXXXXX....XXXXXXXX...XXXXXXXX....XXXXXXXX.XXXXXXXX....XXXXXXXX..XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
-],
-
-# ==================================================
-# HORIZONTAL LEVEL 5 – FAST ENDURANCE RUN
-# ==================================================
-[
-"................................................................................................",
-".............Q.................Q.................Q.................Q..........................",
-".............P.................P.................P.................P..........................",
-"..................C..................C..................C..................C................",
-".............P.................P.................P.................P..........................",
-"..................C..................C..................C..................C................",
-"....E.....E.............E.....E.............E.....E.............E.....E.....................",
-"XXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXX",
-"XXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXX..XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
-],
-
-]
+    # Level sources, compiled and streamed by LevelStore (see levels/README.md)
+    LEVEL_FILES = [os.path.join(LEVEL_DIR, f"level{n}.txt") for n in range(1, 6)]
+
+    # Grid glyphs that spawn things (see the legend above the class)
+    ENEMY_GLYPHS = {
+        'S': "spider", 'M': "mantis", 'C': "caterpillar", 'N': "snail",
+        'O': "scorpion", 'K': "beetle", 'B': "bee",
+    }
+    POWERUP_GLYPHS = {'W': "weapon", 'H': "health"}
+    BOSS_GLYPH = 'D'
+    SOLID_GLYPHS = "XP"
+    # Codes used by the compiled level tables (see LevelStore)
+    SPAWN_TYPES = tuple(ENEMY_GLYPHS.values()) + ("boss",)
+    POWERUP_TYPES = tuple(POWERUP_GLYPHS.values())
+    store = LevelStore(LEVEL_CACHE_DIR)
+    TILE_SIZE = 64
+    # Static tiles are loaded in bands of columns and pre-rendered into one
+    # strip per band, this wide (a multiple of the tile size)
+    CHUNK_WIDTH = 1024
+    BAND_COLUMNS = CHUNK_WIDTH // TILE_SIZE
+    CHUNK_COLORKEY = (255, 0, 255)
+    # Enemies come alive this far outside the screen and are retired back to
+    # spawn records once RETIRE_MARGIN further out (the gap avoids thrashing)
+    ACTIVATION_MARGIN = 256
+    RETIRE_MARGIN = 512
+    # Bands stay loaded out to where the farthest live enemy can be
+    STREAM_MARGIN = ACTIVATION_MARGIN + RETIRE_MARGIN
+    # Collide against merged rects rather than one rect per tile
+    merge_colliders = True
+    # Run the EnemySwarm.TYPES walkers in an EnemySwarm (--enemy-swarm)
+    use_enemy_swarm = False
+    # Outdoor sky gradients (top, bottom), by level; skies are cached per pair
+    SKY_COLORS = [
+        ((100, 150, 255), (150, 220, 255)),  # Level 1: Day
+        ((80, 120, 200), (120, 180, 240)),   # Level 2: Evening
+        ((60, 80, 120), (100, 130, 180))     # Level 3: Dusk
+    ]
+    CAVE_SKY = ((15, 20, 40), (5, 5, 10))  # Boss level - dark cave
+    _skies = {}
+    # Shot sprite each enemy type fires (see Game.update)
+    ENEMY_SHOTS = {"mantis": "wave", "scorpion": "sting", "beetle": "blast", "bee": "honey"}
+
+    @classmethod
+    def asset_manifest(cls, level_num):
+        """Every cached asset a level needs, read off its compiled header"""
+        compiled = cls.store.load(cls.LEVEL_FILES[level_num])
+        spawn_types = compiled.spawn_types
+        manifest = {
+            ("player_frames", ()), ("vehicle_frames", ()), ("projectile", (True,)),
+            ("transformation_frames", ("hero", "vehicle")),
+            ("transformation_frames", ("vehicle", "hero")),
+            ("transformation_sparks", ()), ("platform_tiles", ()),
+            # Player.__init__ picks its frames out of these
+            ("bank", ("player_frames",)), ("bank", ("vehicle_frames",)),
+            ("flash_bank", ("player_frames",)), ("flash_bank", ("vehicle_frames",)),
+        }
+        for enemy_type in spawn_types - {"boss"}:
+            manifest.add(("enemy_" + enemy_type, ()))
+            if enemy_type in Enemy.MIRRORED_TYPES:
+                manifest.add(("bank", ("enemy_" + enemy_type,)))
+            if enemy_type in cls.ENEMY_SHOTS:
+                # Enemy projectiles start out as the orb before being reskinned
+                manifest.add(("enemy_projectile", ("orb",)))
+                manifest.add(("enemy_projectile", (cls.ENEMY_SHOTS[enemy_type],)))
+        for powerup_type in compiled.powerup_types:
+            manifest.add(("powerup", (powerup_type,)))
+        if "boss" in spawn_types:
+            manifest.add(("boss", ()))
+            manifest.add(("flash", ("boss",)))
+            manifest.add(("enemy_projectile", ("orb",)))
+        # Background sprites (see draw_background)
+        if level_num == 3:
+            manifest.add(("crystal_glow", ()))
+        else:
+            manifest.add(("clouds", (level_num,)))
+        return manifest
 
     def __init__(self, level_num):
         self.level_num = level_num
-        self.platforms = []
-        self.enemies = []
+        self.compiled = self.store.load(self.LEVEL_FILES[level_num])
+        self.width = self.compiled.length
+        self.bands = {}  # Loaded LevelBand per band index
+        self.platforms = ()  # Static tiles of the loaded bands, rebuilt when bands change
+        self.colliders = []  # Merged solid rects of the loaded bands plus moving platform rects
+        self.spatial_hash = SpatialHash()
+        # The compiled tile array doubles as the occupancy grid: one byte per
+        # cell, column-major, non-zero where the static tile is solid
+        self.occupancy = self.compiled.tiles
+        self.grid_cols = self.compiled.cols
+        self.grid_rows = self.compiled.rows
+        # The same grid padded for the batched tests (see CompiledLevel.solid_grid)
+        self.solid_grid = self.compiled.solid_grid()
+        self.moving_platforms = []  # MovingPlatform, updated by update_kinematics()
+        self.chunks = []  # (x, y, surface) strips of the loaded bands
+        self.enemies = []  # Live enemies near the camera
+        self.enemy_swarm = EnemySwarm(self) if self.use_enemy_swarm else None  # Live walkers, when enabled
+        # Dormant enemies as (x, y, type, health, spawn id), sorted by x, with
+        # the x values mirrored in spawn_xs for bisect
+        self.spawn_records = []
+        self.spawn_xs = []
+        # Spawns and powerups of the level file that are gone for good, so
+        # reloading their band does not bring them back
+        self.killed_spawn_ids = set()
+        self.collected_powerup_ids = set()
         self.powerups = []
         self.boss = None
         self.scroll_x = 0
-        self.goal_x = MAX_SCROLL_X - 500
-        self.particles = []
+        self.goal_x = self.width - 500
+        self.particles = ParticleSystem()
         self.sticky_trails = []
       
-        self.background_objects = []
+        self.background_objects = BackgroundObjects()
+        self.parallax_layers = []
+        self.sky = self.sky_gradient(level_num)
+        # Cloud sprites outdoors, the crystal glow in the cave
+        if level_num == 3:
+            self.crystal_glow = AssetCache.get("crystal_glow")
+        else:
+            self.clouds = AssetCache.get("clouds", level_num)
         
         self.build_level(level_num)
         self.create_background_objects()
+        self.build_parallax_layers()
         self.dead = False
         self.death_timer = 0
 
@@ -1814,47 +3367,6 @@ class Level:
                 })
     
 
-    def build_from_level_data(self, level_num):
-        level_data = self.LEVELS[level_num]
-        tile_size = 64
-        
-        for y, row in enumerate(level_data):
-            for x, char in enumerate(row):
-                pos_x = x * tile_size
-                pos_y = y * tile_size
-                
-                if char == 'X':
-                    # Ground
-                    self.platforms.append(Platform(pos_x, pos_y))
-                elif char == 'P':
-                    # Platform
-                    self.platforms.append(Platform(pos_x, pos_y, platform_type="ground"))
-                elif char == 'S':
-                    # Spider enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "spider"))
-                elif char == 'M':
-                    # Mantis enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "mantis"))
-                elif char == 'C':
-                    # Caterpillar enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "caterpillar"))
-                elif char == 'N':
-                    # Caterpillar enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "snail"))                    
-                elif char == 'O':
-                    # Scorpion enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "scorpion"))
-                elif char == 'B':
-                    # Beetle enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "beetle"))
-                elif char == 'K':
-                    # Bee enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "bee"))
-                elif char == 'D':
-                    # Boss
-                    self.boss = Boss(pos_x - 125, pos_y - 150)
-    
-    
     
     
     def create_loop(self, center_x, center_y, radius):
@@ -1903,119 +3415,324 @@ class Level:
     
     def create_background_objects(self):
         """Create decorative background objects for each level"""
+        records = []
         if self.level_num == 0:  # Training Grounds
             for i in range(20):
-                x = random.randint(0, MAX_SCROLL_X)
+                x = random.randint(0, self.width)
                 y = random.randint(SCREEN_HEIGHT - 200, SCREEN_HEIGHT - 100)
                 size = random.randint(20, 50)
-                self.background_objects.append({
-                    'type': 'tree',
-                    'x': x,
-                    'y': y,
-                    'size': size
-                })
+                records.append(('tree', x, y, size))
         
         elif self.level_num == 1:  # Enemy Forest
             for i in range(30):
-                x = random.randint(0, MAX_SCROLL_X)
+                x = random.randint(0, self.width)
                 y = random.randint(SCREEN_HEIGHT - 150, SCREEN_HEIGHT - 50)
                 height = random.randint(80, 150)
-                self.background_objects.append({
-                    'type': 'forest_tree',
-                    'x': x,
-                    'y': y,
-                    'height': height
-                })
+                records.append(('forest_tree', x, y, height))
         
         elif self.level_num == 2:  # Caves
             for i in range(40):
-                x = random.randint(0, MAX_SCROLL_X)
+                x = random.randint(0, self.width)
                 y = random.randint(100, SCREEN_HEIGHT - 100)
                 size = random.randint(10, 30)
-                self.background_objects.append({
-                    'type': 'stalactite' if y < SCREEN_HEIGHT//2 else 'stalagmite',
-                    'x': x,
-                    'y': y,
-                    'size': size
-                })
+                records.append(('stalactite' if y < SCREEN_HEIGHT//2 else 'stalagmite', x, y, size))
+        self.background_objects = BackgroundObjects(records)
+    
+    def build_parallax_layers(self):
+        """The parallax layers this level draws its background objects in"""
+        if self.level_num == 3:  # Boss level - cave details
+            self.parallax_layers = [ParallaxLayer(self.background_objects, ('stalactite', 'stalagmite'), 0.3)]
+        else:
+            self.parallax_layers = [ParallaxLayer(self.background_objects, ('tree', 'forest_tree'), 0.5)]
     
     def build_level(self, level_num):
-        level_data = self.LEVELS[level_num]
-        tile_size = 64
-        
-        # Calculate where to place powerups (only on accessible platforms)
-        powerup_positions = []
-        
-        for y, row in enumerate(level_data):
-            for x, char in enumerate(row):
-                pos_x = x * tile_size
-                pos_y = y * tile_size
-                
-                if char == 'X':
-                    # Ground
-                    self.platforms.append(Platform(pos_x, pos_y))
-                elif char == 'P':
-                    # Platform
-                    self.platforms.append(Platform(pos_x, pos_y, platform_type="ground"))
-                    
-                elif char == 'S':
-                    # Spider enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "spider"))
-                
-                elif char == 'M':
-                    # Mantis enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "mantis"))
-                
-                elif char == 'C':
-                    # Caterpillar enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "caterpillar"))
-                elif char == 'BOSS':
-                    # Boss
-                    self.boss = Boss(pos_x - 125, pos_y - 150)
-                elif char == 'N':
-                    # Mantis enemy
-                    self.enemies.append(Enemy(pos_x, pos_y, "snail"))
-                elif char == 'O':
-                    self.enemies.append(Enemy(pos_x, pos_y, "scorpion"))
-                elif char == 'K':
-                    self.enemies.append(Enemy(pos_x, pos_y, "beetle"))
-                elif char == 'B':
-                    self.enemies.append(Enemy(pos_x, pos_y, "bee"))                        
-                elif char == 'W':
-                    # Place Weapon Powerup exactly here
-                    self.powerups.append(Powerup(pos_x + 12, pos_y + 12, "weapon"))
-                elif char == 'H':
-                    # Place Health Powerup exactly here
-                    self.powerups.append(Powerup(pos_x + 12, pos_y + 12, "health"))    
+        # Static tiles, spawns and powerups stream in band by band (see
+        # update_streaming); only the moving platforms are built up front
         if level_num >= 1:
             for i in range(3):
                 x = 500 + i * 800
                 y = SCREEN_HEIGHT - 200 - i * 100
-                moving_platform = Platform(x, y, platform_type="moving")
-                moving_platform.move_direction = 1
-                moving_platform.move_speed = 2
-                moving_platform.move_range = 200
-                moving_platform.start_x = x
-                self.platforms.append(moving_platform)
+                moving_platform = MovingPlatform(x, y)
+                self.moving_platforms.append(moving_platform)
+        
+        self.update_streaming()
+        self.update_activation()
+    
+    def update_streaming(self):
+        """Load the bands of columns around the camera and drop the far ones.
+        
+        The window covers STREAM_MARGIN beyond each screen edge, which is as
+        far out as a live enemy can be, and bands are only dropped one band
+        past it so a camera hovering at a boundary does not thrash.
+        """
+        band_count = -(-self.compiled.cols // self.BAND_COLUMNS)
+        first = max(int(self.scroll_x - self.STREAM_MARGIN) // self.CHUNK_WIDTH, 0)
+        last = min(int(self.scroll_x + SCREEN_WIDTH + self.STREAM_MARGIN) // self.CHUNK_WIDTH,
+                   band_count - 1)
+        
+        changed = False
+        for band in list(self.bands):
+            if band < first - 1 or band > last + 1:
+                self.unload_band(band)
+                changed = True
+        for band in range(first, last + 1):
+            if band not in self.bands:
+                self.load_band(band)
+                changed = True
+        
+        if changed:
+            bands = [self.bands[band] for band in sorted(self.bands)]
+            self.platforms = tuple(p for band in bands for p in band.platforms)
+            self.colliders = ([rect for band in bands for rect in band.colliders]
+                              + [p.rect for p in self.moving_platforms])
+            self.chunks = [band.chunk for band in bands if band.chunk]
+    
+    def load_band(self, band):
+        compiled = self.compiled
+        tile_size = self.TILE_SIZE
+        rows = compiled.rows
+        first_col = band * self.BAND_COLUMNS
+        end_col = min(first_col + self.BAND_COLUMNS, compiled.cols)
+        loaded = LevelBand()
+        
+        # Per-tile platforms only feed the chunk (and per-tile collision)
+        solid = [[compiled.tiles[col * rows + row] != 0 for col in range(first_col, end_col)]
+                 for row in range(rows)]
+        for row in range(rows):
+            for x, is_tile in enumerate(solid[row]):
+                if is_tile:
+                    loaded.platforms.append(Platform((first_col + x) * tile_size, row * tile_size))
+        
+        # Collision uses the band's merged static rects
+        if self.merge_colliders:
+            loaded.colliders = self.merge_solid_grid(solid, tile_size, first_col * tile_size)
+        else:
+            loaded.colliders = [pygame.Rect(p.rect) for p in loaded.platforms]
+        for rect in loaded.colliders:
+            loaded.collider_indices.append(self.spatial_hash.insert(rect))
+        loaded.chunk = self.build_chunk(first_col * tile_size, loaded.platforms)
+        
+        for index, code, col, row in compiled.powerups_in(first_col, end_col):
+            if index in self.collected_powerup_ids:
+                continue
+            # Place Powerup exactly here
+            powerup = Powerup(col * tile_size + 12, row * tile_size + 12, self.POWERUP_TYPES[code])
+            powerup.powerup_id = index
+            loaded.powerups.append(powerup)
+            self.powerups.append(powerup)
+        
+        # Skip spawns whose enemy is still around (live or dormant) or dead
+        present = {enemy.spawn_id for enemy in self.enemies} | self.killed_spawn_ids
+        if self.enemy_swarm is not None:
+            present.update(self.enemy_swarm.spawn_id.tolist())
+        present.update(record[4] for record in self.spawn_records)
+        for index, code, col, row in compiled.spawns_in(first_col, end_col):
+            spawn_type = self.SPAWN_TYPES[code]
+            if spawn_type == "boss":
+                if self.boss is None:
+                    self.boss = Boss(col * tile_size - 125, row * tile_size - 150)
+            elif index not in present:
+                self.add_spawn_record(col * tile_size, row * tile_size, spawn_type, None, index)
+        
+        self.bands[band] = loaded
+    
+    def unload_band(self, band):
+        loaded = self.bands.pop(band)
+        for index in loaded.collider_indices:
+            self.spatial_hash.remove(index)
+        if loaded.powerups:
+            self.powerups = [p for p in self.powerups if p not in loaded.powerups]
+        # Dormant enemies keep their spawn records (position and health), so
+        # they come back as they were left when the band loads again
+    
+    def query_rect(self, rect):
+        """Colliders near rect (a superset of the ones it overlaps).
+        
+        Static rects come from the spatial hash, which never changes between
+        band loads; the few moving platforms are checked after them directly.
+        """
+        found = self.spatial_hash.query_rect(rect)
+        for platform in self.moving_platforms:
+            if platform.rect.colliderect(rect):
+                found.append(platform.rect)
+        return found
+    
+    def add_spawn_record(self, x, y, enemy_type, health, spawn_id):
+        # health is None for fresh spawns, which keep the type's default
+        index = bisect.bisect_right(self.spawn_xs, x)
+        self.spawn_xs.insert(index, x)
+        self.spawn_records.insert(index, (x, y, enemy_type, health, spawn_id))
+    
+    def update_activation(self):
+        """Materialize spawn records near the camera and retire far-off enemies"""
+        left = self.scroll_x - self.ACTIVATION_MARGIN
+        right = self.scroll_x + SCREEN_WIDTH + self.ACTIVATION_MARGIN
+        
+        retired = [enemy for enemy in self.enemies
+                   if enemy.rect.right < left - self.RETIRE_MARGIN
+                   or enemy.rect.left > right + self.RETIRE_MARGIN]
+        for enemy in retired:
+            self.enemies.remove(enemy)
+            self.add_spawn_record(enemy.rect.x, enemy.rect.y, enemy.type, enemy.health, enemy.spawn_id)
+        if self.enemy_swarm is not None:
+            for record in self.enemy_swarm.retire(left - self.RETIRE_MARGIN, right + self.RETIRE_MARGIN):
+                self.add_spawn_record(*record)
+        
+        start = bisect.bisect_left(self.spawn_xs, left)
+        end = bisect.bisect_right(self.spawn_xs, right)
+        if start < end:
+            records = self.spawn_records[start:end]
+            if self.enemy_swarm is not None:
+                self.enemy_swarm.add([record for record in records if record[2] in EnemySwarm.TYPES])
+                records = [record for record in records if record[2] not in EnemySwarm.TYPES]
+            for x, y, enemy_type, health, spawn_id in records:
+                enemy = Enemy(x, y, enemy_type)
+                enemy.spawn_id = spawn_id
+                if health is not None:
+                    enemy.health = health
+                self.enemies.append(enemy)
+            del self.spawn_records[start:end]
+            del self.spawn_xs[start:end]
+    
+    def solid_cells(self, left, top, right, bottom):
+        """Whether each area [left, right) x [top, bottom) (at most 3x3 tiles)
+        overlaps a solid tile of the occupancy grid"""
+        grid = self.solid_grid
+        cols, rows = grid.shape
+        size = self.TILE_SIZE
+        cx0, cx1 = left // size, (right - 1) // size
+        cy0, cy1 = top // size, (bottom - 1) // size
+        # Past the last covered cell just look at the last one again
+        column_offsets = [np.clip(np.minimum(cx0 + dx, cx1) + 1, 0, cols - 1) * rows for dx in range(3)]
+        row_offsets = [np.clip(np.minimum(cy0 + dy, cy1) + 1, 0, rows - 1) for dy in range(3)]
+        flat = grid.ravel()
+        found = flat[column_offsets[0] + row_offsets[0]]
+        for column in column_offsets:
+            for row in row_offsets:
+                found |= flat[column + row]
+        return found
+    
+    def platform_cells(self, left, top, right, bottom):
+        """Whether each area overlaps a moving platform (they are not in the grid)"""
+        found = np.zeros(len(left), bool)
+        for platform in self.moving_platforms:
+            rect = platform.rect
+            found |= (left < rect.right) & (rect.left < right) & (top < rect.bottom) & (rect.top < bottom)
+        return found
+    
+    def solid_in_area(self, x, y, width, height):
+        """Whether an area overlaps a solid tile or a moving platform (no Rect needed)"""
+        size = self.TILE_SIZE
+        rows = self.grid_rows
+        for cx in range(max(x // size, 0), min((x + width - 1) // size + 1, self.grid_cols)):
+            for cy in range(max(y // size, 0), min((y + height - 1) // size + 1, rows)):
+                if self.occupancy[cx * rows + cy]:
+                    return True
+        # Moving platforms are not in the grid
+        for platform in self.moving_platforms:
+            rect = platform.rect
+            if rect.left < x + width and x < rect.right and rect.top < y + height and y < rect.bottom:
+                return True
+        return False
+    
+    def build_chunk(self, chunk_x, tiles):
+        """Render one band's static tiles into a CHUNK_WIDTH-wide strip"""
+        if not tiles:
+            return None
+        # Crop the strip to the rows its tiles actually cover
+        top = min(p.rect.y for p in tiles)
+        bottom = max(p.rect.y + p.image.get_height() for p in tiles)
+        chunk = pygame.Surface((self.CHUNK_WIDTH, bottom - top))
+        chunk.fill(self.CHUNK_COLORKEY)
+        chunk.blits([(p.image, (p.rect.x - chunk_x, p.rect.y - top)) for p in tiles],
+                    doreturn=False)
+        chunk = AssetCache.to_display_format(chunk)
+        chunk.set_colorkey(self.CHUNK_COLORKEY, pygame.RLEACCEL)
+        return chunk_x, top, chunk
+    
+    def spawn_player(self):
+        """Player at the level start, lifted on top of any ground the spawn point is inside"""
+        player = Player(200, SCREEN_HEIGHT - 300)
+        hit = player.rect.collidelist(self.colliders)
+        while hit != -1:
+            player.rect.bottom = self.colliders[hit].top
+            hit = player.rect.collidelist(self.colliders)
+        return player
+    
+    @classmethod
+    def merge_solid_cells(cls, level_data, tile_size=64):
+        """merge_solid_grid() over grid rows given as strings"""
+        cols = max(len(row) for row in level_data)
+        solid = [[x < len(row) and row[x] in cls.SOLID_GLYPHS for x in range(cols)]
+                 for row in level_data]
+        return cls.merge_solid_grid(solid, tile_size)
+    
+    @staticmethod
+    def merge_solid_grid(solid, tile_size=64, origin_x=0):
+        """Greedy meshing: cover the solid cells with as few rects as possible.
+        
+        solid is a list of rows of booleans and is consumed.
+        """
+        rows = len(solid)
+        cols = len(solid[0]) if rows else 0
+        rects = []
+        for y in range(rows):
+            for x in range(cols):
+                if not solid[y][x]:
+                    continue
+                # Widest run along the row, then grow down while the run stays solid
+                w = 1
+                while x + w < cols and solid[y][x + w]:
+                    w += 1
+                h = 1
+                while y + h < rows and all(solid[y + h][x:x + w]):
+                    h += 1
+                for yy in range(y, y + h):
+                    for xx in range(x, x + w):
+                        solid[yy][xx] = False
+                rects.append(pygame.Rect(origin_x + x * tile_size, y * tile_size,
+                                         w * tile_size, h * tile_size))
+        return rects
+    
+    def update_kinematics(self, player):
+        """Move the moving platforms and carry their riders along by the same dx"""
+        for platform in self.moving_platforms:
+            dx = platform.update()
+            if not dx:
+                continue
+            for rider in [player] + self.enemies:
+                if rider.vel_y >= 0 and platform.carries(rider.rect):
+                    self.carry(rider.rect, dx, platform.rect)
+            if self.enemy_swarm is not None:
+                self.enemy_swarm.carry(platform, dx)
+    
+    def carry(self, rider, dx, platform_rect):
+        """Shift a rider's rect by dx, stopping it at any wall it is pushed into"""
+        before = rider.copy()
+        rider.x += dx
+        for rect in self.query_rect(rider):
+            # Ground the rider already overlapped is not a wall it ran into
+            if rect is not platform_rect and rider.colliderect(rect) and not before.colliderect(rect):
+                if dx > 0:
+                    rider.right = rect.left
+                else:
+                    rider.left = rect.right
     
     def update(self, player, keys):
         # Update scroll based on player position (smooth Mario-style camera)
         target_scroll = player.rect.centerx - SCREEN_WIDTH // 2
         self.scroll_x += (target_scroll - self.scroll_x) * 0.08
-        self.scroll_x = max(0, min(self.scroll_x, MAX_SCROLL_X - SCREEN_WIDTH))
+        self.scroll_x = max(0, min(self.scroll_x, self.width - SCREEN_WIDTH))
+        self.update_streaming()
+        self.update_activation()
         
         # Update particles
-        self.particles = [p for p in self.particles if p.update()]
+        self.particles.update()
         
         # Update sticky trails
         self.sticky_trails = [t for t in self.sticky_trails if t.update()]
         
-        # Update moving platforms
-        for platform in self.platforms:
-            if hasattr(platform, 'move_direction'):
-                platform.rect.x += platform.move_speed * platform.move_direction
-                if abs(platform.rect.x - platform.start_x) > platform.move_range:
-                    platform.move_direction *= -1
+        self.update_kinematics(player)
         
         # Collect powerups
         collected_powerups = []
@@ -2023,17 +3740,13 @@ class Level:
             if not powerup.collected and player.rect.colliderect(powerup.rect):
                 player.add_powerup(powerup.type)
                 powerup.collected = True
+                self.collected_powerup_ids.add(powerup.powerup_id)
                 collected_powerups.append(powerup)
                 
                 # Add collection particles
-                for _ in range(30):
-                    color = POWERUP_BLUE if powerup.type == "weapon" else POWERUP_GREEN
-                    self.particles.append(Particle(
-                        powerup.rect.centerx, powerup.rect.centery,
-                        color,
-                        [random.uniform(-4, 4), random.uniform(-6, -3)],
-                        50
-                    ))
+                color = POWERUP_BLUE if powerup.type == "weapon" else POWERUP_GREEN
+                self.particles.emit(powerup.rect.centerx, powerup.rect.centery, 30,
+                                    color, ((-4, 4), (-6, -3)), 50)
         
         for powerup in collected_powerups:
             self.powerups.remove(powerup)
@@ -2059,158 +3772,134 @@ class Level:
         
         return "PLAYING"
     
-    def draw_background(self, screen):
-        # Draw background with gradient based on level
-        if self.level_num == 3:  # Boss level - dark cave
+    @classmethod
+    def sky_gradient(cls, level_num):
+        """Full-screen vertical gradient for a level, rendered once into a
+        one-pixel column and stretched across the screen"""
+        top, bottom = cls.CAVE_SKY if level_num == 3 else cls.SKY_COLORS[min(level_num, 2)]
+        sky = cls._skies.get((top, bottom))
+        if sky is None:
+            column = pygame.Surface((1, SCREEN_HEIGHT))
             for y in range(SCREEN_HEIGHT):
                 progress = y / SCREEN_HEIGHT
-                r = int(15 * (1 - progress) + 5 * progress)
-                g = int(20 * (1 - progress) + 5 * progress)
-                b = int(40 * (1 - progress) + 10 * progress)
-                pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
-            
+                column.set_at((0, y), [int(a * (1 - progress) + b * progress) for a, b in zip(top, bottom)])
+            sky = AssetCache.to_display_format(pygame.transform.scale(column, (SCREEN_WIDTH, SCREEN_HEIGHT)))
+            cls._skies[(top, bottom)] = sky
+        return sky
+    
+    def draw_background(self, screen):
+        # Sky gradient based on level (see sky_gradient)
+        screen.blit(self.sky, (0, 0))
+        if self.level_num == 3:  # Boss level - dark cave
             # Cave details with parallax
-            for obj in self.background_objects:
-                if obj['type'] == 'stalactite':
-                    parallax_x = obj['x'] - self.scroll_x * 0.3
-                    if -100 < parallax_x < SCREEN_WIDTH + 100:
-                        size = obj['size']
-                        points = [
-                            (parallax_x, obj['y']),
-                            (parallax_x - size//2, obj['y'] + size * 2),
-                            (parallax_x + size//2, obj['y'] + size * 2)
-                        ]
-                        pygame.draw.polygon(screen, (80, 70, 60), points)
-                        pygame.draw.polygon(screen, (100, 90, 70), points, 2)
-                
-                elif obj['type'] == 'stalagmite':
-                    parallax_x = obj['x'] - self.scroll_x * 0.3
-                    if -100 < parallax_x < SCREEN_WIDTH + 100:
-                        size = obj['size']
-                        points = [
-                            (parallax_x, obj['y']),
-                            (parallax_x - size//2, obj['y'] - size * 2),
-                            (parallax_x + size//2, obj['y'] - size * 2)
-                        ]
-                        pygame.draw.polygon(screen, (80, 70, 60), points)
-                        pygame.draw.polygon(screen, (100, 90, 70), points, 2)
+            for layer in self.parallax_layers:
+                layer.draw(screen, self.scroll_x)
             
             # Glowing crystals
-            for i in range(10):
-                crystal_x = (i * 400 - self.scroll_x * 0.2) % (SCREEN_WIDTH + 800) - 400
-                crystal_y = 100 + (i * 120) % 400
-                
-                # Crystal glow
-                crystal_surf = pygame.Surface((40, 60), pygame.SRCALPHA)
-                for j in range(5):
-                    alpha = 100 - j * 20
-                    pygame.draw.polygon(crystal_surf, (100, 200, 255, alpha),
-                                      [(20, 0), (0, 60), (40, 60)])
-                screen.blit(crystal_surf, (crystal_x, crystal_y))
+            screen.blits([(self.crystal_glow,
+                           ((i * 400 - self.scroll_x * 0.2) % (SCREEN_WIDTH + 800) - 400,
+                            100 + (i * 120) % 400))
+                          for i in range(10)],
+                         doreturn=False)
         
         else:  # Outdoor levels
-            # Gradient sky
-            sky_colors = [
-                ((100, 150, 255), (150, 220, 255)),  # Level 1: Day
-                ((80, 120, 200), (120, 180, 240)),   # Level 2: Evening
-                ((60, 80, 120), (100, 130, 180))     # Level 3: Dusk
-            ][min(self.level_num, 2)]
-            
-            for y in range(SCREEN_HEIGHT):
-                progress = y / SCREEN_HEIGHT
-                r = int(sky_colors[0][0] * (1 - progress) + sky_colors[1][0] * progress)
-                g = int(sky_colors[0][1] * (1 - progress) + sky_colors[1][1] * progress)
-                b = int(sky_colors[0][2] * (1 - progress) + sky_colors[1][2] * progress)
-                pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
-            
             # Draw clouds with parallax
-            for i in range(8):
-                cloud_x = (i * 450 - self.scroll_x * 0.15) % (SCREEN_WIDTH + 900) - 450
-                cloud_y = 50 + (i * 60) % 150
-                self.draw_cloud(screen, cloud_x, cloud_y, i % 3)
+            screen.blits([(cloud,
+                           ((i * 450 - self.scroll_x * 0.15) % (SCREEN_WIDTH + 900) - 450,
+                            50 + (i * 60) % 150))
+                          for i, cloud in enumerate(self.clouds)],
+                         doreturn=False)
             
             # Draw background objects with parallax
-            for obj in self.background_objects:
-                parallax_x = obj['x'] - self.scroll_x * 0.5
-                
-                if obj['type'] == 'tree' and -200 < parallax_x < SCREEN_WIDTH + 200:
-                    # Simple tree
-                    trunk_height = obj['size']
-                    trunk_width = trunk_height // 4
-                    pygame.draw.rect(screen, (100, 70, 40),
-                                   (parallax_x - trunk_width//2, obj['y'] - trunk_height,
-                                    trunk_width, trunk_height))
-                    
-                    foliage_size = trunk_height
-                    pygame.draw.circle(screen, (60, 120, 60),
-                                     (parallax_x, obj['y'] - trunk_height - foliage_size//2),
-                                     foliage_size//2)
-                
-                elif obj['type'] == 'forest_tree' and -300 < parallax_x < SCREEN_WIDTH + 300:
-                    # Forest tree
-                    trunk_height = obj['height']
-                    trunk_width = trunk_height // 6
-                    pygame.draw.rect(screen, (80, 50, 30),
-                                   (parallax_x - trunk_width//2, obj['y'] - trunk_height,
-                                    trunk_width, trunk_height))
-                    
-                    # Layered foliage
-                    for j in range(3):
-                        layer_size = trunk_height * (0.8 - j * 0.2)
-                        layer_y = obj['y'] - trunk_height - j * (layer_size//3)
-                        color_shade = 40 - j * 10
-                        pygame.draw.circle(screen, (40 + color_shade, 100 + color_shade, 40),
-                                         (parallax_x, layer_y), layer_size//2)
-    
-    def draw_cloud(self, screen, x, y, cloud_type):
-        cloud_surf = pygame.Surface((180, 80), pygame.SRCALPHA)
-        
-        if cloud_type == 0:  # Fluffy cloud
-            pygame.draw.ellipse(cloud_surf, (255, 255, 255, 220), (0, 40, 100, 30))
-            pygame.draw.ellipse(cloud_surf, (255, 255, 255, 220), (40, 30, 120, 40))
-            pygame.draw.ellipse(cloud_surf, (255, 255, 255, 220), (80, 40, 100, 30))
-        
-        elif cloud_type == 1:  # Wispy cloud
-            for i in range(5):
-                offset = i * 25
-                width = 60 + random.randint(-10, 10)
-                height = 20 + random.randint(-5, 5)
-                alpha = 180 + random.randint(-30, 30)
-                pygame.draw.ellipse(cloud_surf, (255, 255, 255, alpha),
-                                  (offset, 30 + i * 8, width, height))
-        
-        else:  # Storm cloud
-            pygame.draw.ellipse(cloud_surf, (150, 150, 170, 200), (0, 30, 160, 50))
-            pygame.draw.ellipse(cloud_surf, (130, 130, 150, 180), (20, 40, 140, 40))
-        
-        screen.blit(cloud_surf, (x, y))
+            for layer in self.parallax_layers:
+                layer.draw(screen, self.scroll_x)
+    
+    @staticmethod
+    def background_object_extent(object_type, y, size):
+        """(top, bottom) rows a background object can cover, outline included"""
+        if object_type == 'stalactite':
+            return y - 2, y + size * 2 + 2
+        return y - size * 2 - 2, y + 2
+    
+    @staticmethod
+    def draw_background_object(surface, object_type, x, y, size):
+        """Draw one background object with its base at (x, y)"""
+        if object_type == 'tree':
+            # Simple tree
+            trunk_height = size
+            trunk_width = trunk_height // 4
+            pygame.draw.rect(surface, (100, 70, 40),
+                           (x - trunk_width//2, y - trunk_height,
+                            trunk_width, trunk_height))
+            
+            foliage_size = trunk_height
+            pygame.draw.circle(surface, (60, 120, 60),
+                             (x, y - trunk_height - foliage_size//2),
+                             foliage_size//2)
+        
+        elif object_type == 'forest_tree':
+            # Forest tree
+            trunk_height = size
+            trunk_width = trunk_height // 6
+            pygame.draw.rect(surface, (80, 50, 30),
+                           (x - trunk_width//2, y - trunk_height,
+                            trunk_width, trunk_height))
+            
+            # Layered foliage
+            for j in range(3):
+                layer_size = trunk_height * (0.8 - j * 0.2)
+                layer_y = y - trunk_height - j * (layer_size//3)
+                color_shade = 40 - j * 10
+                pygame.draw.circle(surface, (40 + color_shade, 100 + color_shade, 40),
+                                 (x, layer_y), layer_size//2)
+        
+        elif object_type in ('stalactite', 'stalagmite'):
+            tip_y = y + size * 2 if object_type == 'stalactite' else y - size * 2
+            points = [
+                (x, y),
+                (x - size//2, tip_y),
+                (x + size//2, tip_y)
+            ]
+            pygame.draw.polygon(surface, (80, 70, 60), points)
+            pygame.draw.polygon(surface, (100, 90, 70), points, 2)
     
     def draw(self, screen, player):
         # Draw background
         self.draw_background(screen)
         
-        # Draw platforms
-        for platform in self.platforms:
-            if platform.rect.right > self.scroll_x - 100 and platform.rect.left < self.scroll_x + SCREEN_WIDTH + 100:
-                screen.blit(platform.image, (platform.rect.x - self.scroll_x, platform.rect.y))
+        # Sprites are atlas subsurfaces, so each group goes out in one blits() call
+        # Draw platforms: static tiles from the pre-rendered chunks, moving ones live
+        # On-screen sprites land at int(x - scroll_x), i.e. x - ceil(scroll_x)
+        camera_x = math.ceil(self.scroll_x)
+        screen.blits([(chunk, (chunk_x - camera_x, chunk_y))
+                      for chunk_x, chunk_y, chunk in self.chunks
+                      if chunk_x + self.CHUNK_WIDTH > self.scroll_x and chunk_x < self.scroll_x + SCREEN_WIDTH],
+                     doreturn=False)
+        screen.blits([(platform.image, (platform.rect.x - self.scroll_x, platform.rect.y))
+                      for platform in self.moving_platforms
+                      if platform.rect.right > self.scroll_x - 100 and platform.rect.left < self.scroll_x + SCREEN_WIDTH + 100],
+                     doreturn=False)
         
         # Draw sticky trails
         for trail in self.sticky_trails:
             screen.blit(trail.surf, (trail.rect.x - self.scroll_x, trail.rect.y))
         
         # Draw particles
-        for particle in self.particles:
-            particle.draw(screen, self.scroll_x)
+        self.particles.draw(screen, self.scroll_x)
         
         # Draw powerups
-        for powerup in self.powerups:
-            if powerup.rect.right > self.scroll_x - 50 and powerup.rect.left < self.scroll_x + SCREEN_WIDTH + 50:
-                screen.blit(powerup.image, (powerup.rect.x - self.scroll_x, powerup.rect.y))
+        screen.blits([(powerup.image, (powerup.rect.x - self.scroll_x, powerup.rect.y))
+                      for powerup in self.powerups
+                      if powerup.rect.right > self.scroll_x - 50 and powerup.rect.left < self.scroll_x + SCREEN_WIDTH + 50],
+                     doreturn=False)
         
         # Draw enemies
-        for enemy in self.enemies:
-            if enemy.rect.right > self.scroll_x - 100 and enemy.rect.left < self.scroll_x + SCREEN_WIDTH + 100:
-                screen.blit(enemy.image, (enemy.rect.x - self.scroll_x, enemy.rect.y))
+        screen.blits([(enemy.image, (enemy.rect.x - self.scroll_x, enemy.rect.y))
+                      for enemy in self.enemies
+                      if enemy.rect.right > self.scroll_x - 100 and enemy.rect.left < self.scroll_x + SCREEN_WIDTH + 100],
+                     doreturn=False)
+        if self.enemy_swarm is not None:
+            self.enemy_swarm.draw(screen, self.scroll_x)
         
         # Draw boss
         if self.boss and self.boss.rect.right > self.scroll_x - 200 and self.boss.rect.left < self.scroll_x + SCREEN_WIDTH + 200:
@@ -2219,7 +3908,7 @@ class Level:
 # ================= UI RENDERER =================
 class UIRenderer:
     @staticmethod
-    def draw_hud(screen, player, level_num, scroll_x, lives, score):
+    def draw_hud(screen, player, level_num, scroll_x, lives, score, level_length=MAX_SCROLL_X):
         # Health bar (Mario-style)
         bar_width = 200
         bar_height = 25
@@ -2303,7 +3992,7 @@ class UIRenderer:
         screen.blit(level_text, (SCREEN_WIDTH - 200, bar_y + 50))
         
         # Progress bar (Super Mario World style)
-        progress = scroll_x / (MAX_SCROLL_X - 500)
+        progress = scroll_x / (level_length - 500)
         prog_width = 300
         prog_height = 12
         prog_x = SCREEN_WIDTH // 2 - prog_width // 2
@@ -2486,7 +4175,7 @@ class UIRenderer:
         
         # Robot showcase
         if math.sin(showcase_time) > 0:
-            robot_frame = Assets.create_player_frames()[int(showcase_time * 5) % 8]
+            robot_frame = AssetCache.get("player_frames")[int(showcase_time * 5) % 8]
             robot_scaled = pygame.transform.scale(robot_frame, (80, 120))
             self.screen.blit(robot_scaled, (showcase_x - 150, showcase_y))
             
@@ -2494,7 +4183,7 @@ class UIRenderer:
             robot_label = font_small.render("ROBOT MODE", True, (100, 200, 255))
             self.screen.blit(robot_label, (showcase_x - 150 - robot_label.get_width()//2 + 40, showcase_y + 130))
         else:
-            vehicle_frame = Assets.create_vehicle_frames()[int(showcase_time * 5) % 8]
+            vehicle_frame = AssetCache.get("vehicle_frames")[int(showcase_time * 5) % 8]
             vehicle_scaled = pygame.transform.scale(vehicle_frame, (120, 60))
             self.screen.blit(vehicle_scaled, (showcase_x - 60, showcase_y + 30))
             
@@ -2626,13 +4315,13 @@ class UIRenderer:
         powerup_y = 350
         
         # Weapon power-up
-        weapon_surf = Assets.create_powerup("weapon")
+        weapon_surf = AssetCache.get("powerup", "weapon")
         screen.blit(weapon_surf, (powerup_x, powerup_y))
         weapon_text = font_text.render("= Energy Blast (10 sec)", True, (100, 200, 255))
         screen.blit(weapon_text, (powerup_x + 50, powerup_y + 10))
         
         # Health power-up
-        health_surf = Assets.create_powerup("health")
+        health_surf = AssetCache.get("powerup", "health")
         screen.blit(health_surf, (powerup_x, powerup_y + 60))
         health_text = font_text.render("= Restore 2 Health", True, (100, 255, 100))
         screen.blit(health_text, (powerup_x + 50, powerup_y + 70))
@@ -2643,15 +4332,25 @@ class UIRenderer:
 
 # ================= MAIN GAME CLASS =================
 class Game:
+    # (low, high) colour range of each enemy type's death particles; the
+    # types not listed use the spider's
+    DEATH_COLORS = {
+        "snail": ((180, 60, 60), (220, 100, 100)),
+        "caterpillar": ((0, 150, 0), (50, 200, 50)),
+        "mantis": ((140, 0, 140), (180, 0, 180)),
+        "spider": ((100, 80, 40), (140, 120, 80)),
+    }
+    
     def __init__(self):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Transformer Robot Adventure - Enhanced Edition")
+        AssetCache.convert_for_display()
         self.clock = pygame.time.Clock()
         self.state = GameState.MENU
         self.current_level = 0
         self.player = None
         self.level = None
-        self.projectiles = []
+        self.projectiles = ProjectilePool()
         self.running = True
         
     
@@ -2671,17 +4370,22 @@ class Game:
         
     
     def reset_game(self):
-        self.player = Player(200, SCREEN_HEIGHT - 300)
+        # Bake what this level uses (and drop the rest) before building it
+        AssetCache.preload(Level.asset_manifest(self.current_level))
         self.level = Level(self.current_level)
-        self.projectiles = []
+        self.player = self.level.spawn_player()
+        self.projectiles = ProjectilePool()
         self.state = GameState.PLAYING
         self.transforming = False
+        # Bake both transformation directions up front so T never hitches
+        AssetCache.get_transformation("hero", "vehicle")
+        AssetCache.get_transformation("vehicle", "hero")
     
     def start_transformation(self):
         if not self.transforming and self.player.transform_cooldown == 0:
             self.transforming = True
             self.transformation_start_mode = self.player.mode
-            self.transformation_frames = Assets.create_transformation_frames(
+            self.transformation_frames = AssetCache.get_transformation(
                 self.player.mode,
                 "vehicle" if self.player.mode == "hero" else "hero"
             )
@@ -2789,26 +4493,9 @@ class Game:
         
         keys = pygame.key.get_pressed()
         
-        self.projectiles = [p for p in self.projectiles if p.update(self.level.scroll_x)]
-        for projectile in self.projectiles:
-            for platform in self.level.platforms:
-                if projectile.rect.colliderect(platform.rect):
-                    # Create small impact particles when hitting a wall
-                    for _ in range(5):
-                        impact_color = WHITE if projectile.is_player else (255, 165, 0)
-                        self.level.particles.append(Particle(
-                            projectile.rect.centerx, projectile.rect.centery,
-                            impact_color,
-                            [random.uniform(-3, 3), random.uniform(-3, 3)],
-                            15, size=2
-                        ))
-                    
-                    # Setting vel_x to 0 marks it for removal in your existing cleanup logic
-                    projectile.vel_x = 0 
-                    break        
         # Update player (but don't allow transformation during transformation animation)
         if not keys[pygame.K_t] or self.player.transform_cooldown > 0:
-            self.player.update(keys, self.level.platforms, self.level.scroll_x)
+            self.player.update(keys, self.level, self.level.scroll_x)
        
         # Check if player died (health or falling)
         if self.player.health <= 0 or self.player.dead:
@@ -2827,12 +4514,17 @@ class Game:
                 self.score += 5
         
         # Update projectiles
-        self.projectiles = [p for p in self.projectiles if p.update(self.level.scroll_x)]
+        for i in self.projectiles.step(self.level, self.level.scroll_x):
+            # Create small impact particles when hitting a wall
+            rect = self.projectiles.rect(i)
+            impact_color = WHITE if self.projectiles.is_player[i] else (255, 165, 0)
+            self.level.particles.emit(rect.centerx, rect.centery, 5,
+                                      impact_color, ((-3, 3), (-3, 3)), 15, size=2)
         
         # Update enemies
         for enemy in self.level.enemies[:]:
             # Enemy behavior
-            result = enemy.update(self.player.rect, self.level.platforms, 
+            result = enemy.update(self.player.rect, self.level, 
                                  self.level.scroll_x, self.projectiles, 
                                  self.level.sticky_trails)
             
@@ -2848,9 +4540,7 @@ class Game:
                 drop.vel_x = 0
                 drop.vel_y = 5
                 # Custom Honey Look
-                drop.image = pygame.Surface((15, 20), pygame.SRCALPHA)
-                pygame.draw.ellipse(drop.image, (255, 220, 0), (0, 0, 15, 20)) # Golden Yellow
-                pygame.draw.circle(drop.image, (255, 255, 255, 150), (5, 5), 3) # Highlight
+                drop.image = AssetCache.get("enemy_projectile", "honey")
                 self.projectiles.append(drop)
 
             elif result == "mantis_fire":
@@ -2858,8 +4548,7 @@ class Game:
                 wave = Projectile(enemy.rect.centerx, enemy.rect.centery, enemy.move_direction, False, 1)
                 wave.vel_x = enemy.move_direction * 12
                 # Green energy blade look
-                wave.image = pygame.Surface((30, 40), pygame.SRCALPHA)
-                pygame.draw.ellipse(wave.image, (0, 255, 100, 180), (0, 0, 10, 40))
+                wave.image = AssetCache.get("enemy_projectile", "wave")
                 self.projectiles.append(wave)
 
             elif result == "scorpion_fire":
@@ -2867,8 +4556,7 @@ class Game:
                 sting = Projectile(enemy.rect.centerx, enemy.rect.top, enemy.move_direction, False, 1)
                 sting.vel_x = enemy.move_direction * 8
                 # Purple venom look
-                sting.image = pygame.Surface((12, 12), pygame.SRCALPHA)
-                pygame.draw.circle(sting.image, (180, 0, 255), (6, 6), 6)
+                sting.image = AssetCache.get("enemy_projectile", "sting")
                 self.projectiles.append(sting)
 
             elif result == "beetle_fire":
@@ -2876,42 +4564,22 @@ class Game:
                 blast = Projectile(enemy.rect.centerx, enemy.rect.centery, enemy.move_direction, False, 2)
                 blast.vel_x = enemy.move_direction * 4
                 # Large red/black blast
-                blast.image = pygame.Surface((25, 25), pygame.SRCALPHA)
-                pygame.draw.circle(blast.image, (50, 0, 0), (12, 12), 12)
-                pygame.draw.circle(blast.image, (255, 0, 0), (12, 12), 8)
+                blast.image = AssetCache.get("enemy_projectile", "blast")
                 self.projectiles.append(blast)
 
             ###
-            # Check enemy collisions with player projectiles
-            for projectile in self.projectiles[:]:
-                if projectile.is_player and enemy.rect.colliderect(projectile.rect):
-                    if enemy.take_damage(projectile.damage):
-                        self.level.enemies.remove(enemy)
-                        self.score += 100
-                        # Enhanced death particles
-                        for _ in range(25):
-                            if enemy.type == "snail":
-                                color = (random.randint(180, 220), random.randint(60, 100), random.randint(60, 100))
-                            elif enemy.type == "caterpillar":
-                                color = (random.randint(0, 50), random.randint(150, 200), random.randint(0, 50))
-                            elif enemy.type == "mantis":
-                                color = (random.randint(140, 180), 0, random.randint(140, 180))
-                            else:  # spider
-                                color = (random.randint(100, 140), random.randint(80, 120), random.randint(40, 80))
-                            
-                            self.level.particles.append(Particle(
-                                enemy.rect.centerx, enemy.rect.centery,
-                                color,
-                                [random.uniform(-6, 6), random.uniform(-8, -3)],
-                                random.randint(40, 80)
-                            ))
-                    projectile.vel_x = 0  # Mark for removal
-            
             # Check enemy collisions with player
             if enemy.rect.colliderect(self.player.rect):
                 if self.player.take_damage(1):
                     self.score -= 50
         
+        # Check enemy collisions with player projectiles
+        self.hit_enemies()
+        
+        # Update the walkers run by the enemy swarm
+        if self.level.enemy_swarm is not None:
+            self.update_enemy_swarm()
+        
         # Update boss
         if self.level.boss:
             boss_projectiles = self.level.boss.update(self.player.rect, self.level.platforms,
@@ -2920,32 +4588,25 @@ class Game:
                 self.projectiles.extend(boss_projectiles)
             
             # Check boss collisions with player projectiles
-            for projectile in self.projectiles[:]:
-                if projectile.is_player and self.level.boss.rect.colliderect(projectile.rect):
-                    if self.level.boss.take_damage(projectile.damage):
-                        self.score += 50
-                        # Boss hit particles
-                        for _ in range(10):
-                            self.level.particles.append(Particle(
-                                projectile.rect.centerx, projectile.rect.centery,
-                                (255, 100, 100),
-                                [random.uniform(-3, 3), random.uniform(-3, 3)],
-                                random.randint(20, 40)
-                            ))
-                    projectile.vel_x = 0
+            for i in self.projectiles.overlapping(self.level.boss.rect, True):
+                rect = self.projectiles.rect(i)
+                if self.level.boss.take_damage(self.projectiles.spend(i)):
+                    self.score += 50
+                    # Boss hit particles
+                    self.level.particles.emit(rect.centerx, rect.centery, 10,
+                                              (255, 100, 100), ((-3, 3), (-3, 3)), (20, 40))
         
         # Check player collisions with enemy projectiles
-        for projectile in self.projectiles[:]:
-            if not projectile.is_player and self.player.rect.colliderect(projectile.rect):
-                if self.player.take_damage(projectile.damage):
-                    self.score -= 25
-                    # Slow effect from web projectiles
-                    if hasattr(projectile, 'slow_effect') and projectile.slow_effect:
-                        self.player.vel_x *= 0.3
-                projectile.vel_x = 0
-        
-        # Clean up projectiles marked for removal
-        self.projectiles = [p for p in self.projectiles if p.vel_x != 0]
+        for i in self.projectiles.overlapping(self.player.rect, False):
+            slow_effect = self.projectiles.slow_effect[i]
+            if self.player.take_damage(self.projectiles.spend(i)):
+                self.score -= 25
+                # Slow effect from web projectiles
+                if slow_effect:
+                    self.player.vel_x *= 0.3
+        
+        # Clean up spent projectiles
+        self.projectiles.compact()
         
         # Update level
         level_status = self.level.update(self.player, keys)
@@ -2962,6 +4623,74 @@ class Game:
             self.score += 1000 * (self.current_level + 1)
             self.state = GameState.LEVEL_COMPLETE
     
+    def update_enemy_swarm(self):
+        """The per-enemy loop of update() for the enemies in the level's EnemySwarm"""
+        swarm = self.level.enemy_swarm
+        for indices, event in swarm.update():
+            for i in indices:
+                rect = swarm.rect(i)
+                direction = int(swarm.direction[i])
+                if event == "sticky":
+                    # Caterpillar leaves sticky trail
+                    trail = StickyTrail(rect.centerx - 20, rect.bottom)
+                    trail.damage = 1
+                    self.level.sticky_trails.append(trail)
+                elif event == "scorpion_fire":
+                    sting = Projectile(rect.centerx, rect.top, direction, False, 1)
+                    sting.vel_x = direction * 8
+                    sting.image = AssetCache.get("enemy_projectile", "sting")
+                    self.projectiles.append(sting)
+                elif event == "beetle_fire":
+                    blast = Projectile(rect.centerx, rect.centery, direction, False, 2)
+                    blast.vel_x = direction * 4
+                    blast.image = AssetCache.get("enemy_projectile", "blast")
+                    self.projectiles.append(blast)
+        
+        # Player projectiles; each is spent on the first live enemy it hits
+        killed = np.zeros(len(swarm), bool)
+        for i, shot in self.projectiles.hits(swarm.x, swarm.y, swarm.x + swarm.w, swarm.y + swarm.h, True):
+            if killed[i] or not self.projectiles.alive[shot]:
+                continue
+            swarm.health[i] -= self.projectiles.spend(shot)
+            if swarm.health[i] <= 0:
+                killed[i] = True
+                self.level.killed_spawn_ids.add(int(swarm.spawn_id[i]))
+                self.score += 100
+                self.add_death_particles(EnemySwarm.TYPES[swarm.type_id[i]], swarm.rect(i))
+        if killed.any():
+            swarm.keep(~killed)
+        
+        for i in swarm.overlapping(self.player.rect):
+            if self.player.take_damage(1):
+                self.score -= 50
+    
+    def hit_enemies(self):
+        """Player projectiles against the level's enemies, tested in one batch;
+        each projectile is spent on the first live enemy it hits"""
+        enemies = self.level.enemies
+        if not enemies:
+            return
+        rects = np.array([enemy.rect for enemy in enemies], np.int64)
+        left, top = rects[:, 0], rects[:, 1]
+        killed = []
+        for target, shot in self.projectiles.hits(left, top, left + rects[:, 2], top + rects[:, 3], True):
+            if (killed and killed[-1] == target) or not self.projectiles.alive[shot]:
+                continue
+            enemy = enemies[target]
+            if enemy.take_damage(self.projectiles.spend(shot)):
+                killed.append(target)
+                self.level.killed_spawn_ids.add(enemy.spawn_id)
+                self.score += 100
+                self.add_death_particles(enemy.type, enemy.rect)
+        for target in reversed(killed):
+            del enemies[target]
+    
+    def add_death_particles(self, enemy_type, rect):
+        # Enhanced death particles
+        colors = self.DEATH_COLORS.get(enemy_type, self.DEATH_COLORS["spider"])
+        self.level.particles.emit(rect.centerx, rect.centery, 25,
+                                  colors, ((-6, 6), (-8, -3)), (40, 80))
+    
     def draw(self):
         if self.state == GameState.MENU:
             self.draw_main_menu()
@@ -2979,19 +4708,22 @@ class Game:
                     self.screen.blit(transform_surf,
                                    (self.player.rect.centerx - self.level.scroll_x - 50,
                                     self.player.rect.centery - 45))
+                    Assets.draw_transformation_particles(
+                        self.screen,
+                        self.player.rect.centerx - self.level.scroll_x,
+                        self.player.rect.centery,
+                        self.transformation_index / (len(self.transformation_frames) - 1))
             else:
                 # Draw player
                 self.screen.blit(self.player.image, 
                                (self.player.rect.x - self.level.scroll_x, self.player.rect.y))
             
             # Draw projectiles
-            for projectile in self.projectiles:
-                self.screen.blit(projectile.image,
-                               (projectile.rect.x - self.level.scroll_x, projectile.rect.y))
+            self.projectiles.draw(self.screen, self.level.scroll_x)
             
             # Draw UI
             UIRenderer.draw_hud(self.screen, self.player, self.current_level, 
-                              self.level.scroll_x, self.lives, self.score)
+                              self.level.scroll_x, self.lives, self.score, self.level.width)
             
             if self.level.boss and self.level.boss.health > 0:
                 UIRenderer.draw_boss_health(self.screen, self.level.boss)
@@ -3072,7 +4804,7 @@ class Game:
         
         # Robot showcase
         if math.sin(showcase_time) > 0:
-            robot_frame = Assets.create_player_frames()[int(showcase_time * 5) % 8]
+            robot_frame = AssetCache.get("player_frames")[int(showcase_time * 5) % 8]
             robot_scaled = pygame.transform.scale(robot_frame, (80, 120))
             self.screen.blit(robot_scaled, (showcase_x - 150, showcase_y))
             
@@ -3080,7 +4812,7 @@ class Game:
             robot_label = font_small.render("ROBOT MODE", True, (100, 200, 255))
             self.screen.blit(robot_label, (showcase_x - 150 - robot_label.get_width()//2 + 40, showcase_y + 130))
         else:
-            vehicle_frame = Assets.create_vehicle_frames()[int(showcase_time * 5) % 8]
+            vehicle_frame = AssetCache.get("vehicle_frames")[int(showcase_time * 5) % 8]
             vehicle_scaled = pygame.transform.scale(vehicle_frame, (120, 60))
             self.screen.blit(vehicle_scaled, (showcase_x - 60, showcase_y + 30))
             
@@ -3157,6 +4889,21 @@ class Game:
 
 # ================= MAIN ENTRY POINT =================
 if __name__ == "__main__":
+    if "--enemy-swarm" in sys.argv:
+        Level.use_enemy_swarm = True
+
+    if "--bake-sprites" in sys.argv:
+        # Install step: write every baked sprite to SPRITE_CACHE_DIR up front
+        AssetCache.bake_all()
+        print(AssetCache.stats())
+        pygame.quit()
+        sys.exit()
+
+    if "--parallel-bake" in sys.argv:
+        baked, wall, serial = AssetCache.bake_all_parallel()
+        if baked:
+            print(f"Baked {baked} assets in {wall:.2f}s on {os.cpu_count()} cores, "
+                  f"{serial / wall:.1f}x a serial bake ({serial:.2f}s)")
 
     game = Game()
     game.run()
\ No newline at end of file
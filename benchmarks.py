@@ -0,0 +1,440 @@
+"""Timing benchmarks for the game, run with: python benchmarks.py <name>
+
+Set SDL_VIDEODRIVER=dummy and SDL_AUDIODRIVER=dummy to run them without a
+window or an audio device. The checks that the faster paths behave like
+the ones they replaced live in tests/.
+"""
+import importlib.util
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# The game file's name is not a valid module name, so load it by path
+spec = importlib.util.spec_from_file_location(
+    "game", os.path.join(os.path.dirname(os.path.abspath(__file__)), "TransforrGAME_full-1.py"))
+sys.modules["game"] = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(sys.modules["game"])
+
+from game import (SCREEN_WIDTH, SCREEN_HEIGHT, pygame, AssetCache, BackgroundObjects, Enemy, EnemySwarm,
+                  Game, Level, LevelStore, ParticleSystem, Projectile, ProjectilePool, SpatialHash)
+
+
+def collision_scaling(queries=20000):
+    """Time collider queries on level 2 and on a copy ten times as long"""
+    rng = random.Random(0)
+    for repeat in (1, 10):
+        grid = [row * repeat for row in LevelStore.read_source(Level.LEVEL_FILES[1])[0]]
+        rects = Level.merge_solid_cells(grid)
+        spatial_hash = SpatialHash()
+        for rect in rects:
+            spatial_hash.insert(rect)
+        width = max(len(row) for row in grid) * 64
+        probes = [pygame.Rect(rng.randrange(width), rng.randrange(SCREEN_HEIGHT), 60, 90)
+                  for _ in range(queries)]
+
+        start = time.perf_counter()
+        for probe in probes:
+            [rect for rect in rects if probe.colliderect(rect)]
+        linear = time.perf_counter() - start
+        start = time.perf_counter()
+        for probe in probes:
+            [rect for rect in spatial_hash.query_rect(probe) if probe.colliderect(rect)]
+        hashed = time.perf_counter() - start
+        print(f"{width}px level, {len(rects)} colliders: linear {linear / queries * 1e6:.2f} us, "
+              f"spatial hash {hashed / queries * 1e6:.2f} us per query")
+
+
+def entity_activation(step=16):
+    """Sweep the camera across each level and count the live enemies"""
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for level_num in range(len(Level.LEVEL_FILES)):
+        level = Level(level_num)
+        total = len(level.compiled.spawn_table) // LevelStore.RECORD.size
+        live = []
+        for scroll_x in range(0, level.width - SCREEN_WIDTH, step):
+            level.scroll_x = scroll_x
+            level.update_streaming()
+            level.update_activation()
+            live.append(len(level.enemies))
+        print(f"level {level_num + 1}: {total} enemies, live max {max(live)}, "
+              f"average {sum(live) / len(live):.1f}")
+
+
+def level_switch_memory(cycles=3):
+    """Switch through every level repeatedly and report the cache footprint"""
+    game = Game()
+    for cycle in range(cycles):
+        for level_num in range(len(Level.LEVEL_FILES)):
+            game.current_level = level_num
+            game.reset_game()
+            for _ in range(30):
+                game.update()
+                game.draw()
+            stats = AssetCache.stats()
+            print(f"cycle {cycle + 1} level {level_num + 1}: {stats['entries']} entries, "
+                  f"{stats['bytes'] / 1024:,.0f} KiB, {stats['atlas_pages']} atlas pages")
+
+
+def platform_layer(rounds=300):
+    """Time drawing the tiles one by one against the pre-rendered chunks"""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    AssetCache.convert_for_display()
+    for level_num in range(len(Level.LEVEL_FILES)):
+        level = Level(level_num)
+        per_tile = chunked = 0
+        for i in range(rounds):
+            scroll_x = i * (level.width - SCREEN_WIDTH) / rounds
+            level.scroll_x = scroll_x
+            level.update_streaming()
+
+            start = time.perf_counter()
+            screen.blits([(p.image, (p.rect.x - scroll_x, p.rect.y)) for p in level.platforms
+                          if p.rect.right > scroll_x - 100 and p.rect.left < scroll_x + SCREEN_WIDTH + 100],
+                         doreturn=False)
+            per_tile += time.perf_counter() - start
+
+            start = time.perf_counter()
+            camera_x = math.ceil(scroll_x)
+            screen.blits([(chunk, (chunk_x - camera_x, chunk_y)) for chunk_x, chunk_y, chunk in level.chunks
+                          if chunk_x + Level.CHUNK_WIDTH > scroll_x and chunk_x < scroll_x + SCREEN_WIDTH],
+                         doreturn=False)
+            chunked += time.perf_counter() - start
+        print(f"level {level_num + 1}: per tile {per_tile / rounds * 1000:.3f} ms, "
+              f"chunks {chunked / rounds * 1000:.3f} ms ({per_tile / chunked:.1f}x)")
+
+
+def level_streaming(repeats=(1, 100), step=64):
+    """Load and scroll through level 1 as is and repeated end to end"""
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    AssetCache.bake_all()
+    rows, metadata = LevelStore.read_source(Level.LEVEL_FILES[0])
+    work_dir = tempfile.mkdtemp()
+    level_files, store = Level.LEVEL_FILES, Level.store
+    Level.store = LevelStore(work_dir)
+    try:
+        for repeat in repeats:
+            source = os.path.join(work_dir, f"level1x{repeat}.txt")
+            with open(source, 'w', encoding="utf-8") as f:
+                f.write("\n".join(row.ljust(len(max(rows, key=len)), ".") * repeat for row in rows))
+            Level.LEVEL_FILES = [source]
+
+            start = time.perf_counter()
+            Level.store.load(source)
+            compile_time = time.perf_counter() - start
+            Level.store.levels.clear()
+            start = time.perf_counter()
+            level = Level(0)
+            load_time = time.perf_counter() - start
+
+            most_bands = most_tiles = 0
+            start = time.perf_counter()
+            for scroll_x in range(0, level.width - SCREEN_WIDTH, step):
+                level.scroll_x = scroll_x
+                level.update_streaming()
+                level.update_activation()
+                most_bands = max(most_bands, len(level.bands))
+                most_tiles = max(most_tiles, len(level.platforms))
+            frames = (level.width - SCREEN_WIDTH) // step
+            print(f"{level.width:,}px level: compile {compile_time * 1000:.1f} ms, "
+                  f"load {load_time * 1000:.1f} ms, {(time.perf_counter() - start) / frames * 1e6:.0f} us "
+                  f"per scroll step, at most {most_bands} bands / {most_tiles} tiles resident")
+    finally:
+        Level.LEVEL_FILES, Level.store = level_files, store
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def platform_riders(frames=600):
+    """Time the kinematic update with the player riding each moving platform
+    of level 4"""
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for index in range(3):
+        level = Level(3)
+        platform = level.moving_platforms[index]
+        player = level.spawn_player()
+        player.rect.midbottom = platform.rect.midtop
+        start = time.perf_counter()
+        for _ in range(frames):
+            level.update_kinematics(player)
+        kinematics = time.perf_counter() - start
+        print(f"platform {index + 1}: {kinematics / frames * 1e6:.1f} us per kinematic update")
+
+
+def sky_gradient(rounds=300):
+    """Time drawing each level's sky line by line against the cached surface"""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    reference = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for level_num in range(len(Level.LEVEL_FILES)):
+        sky = Level.sky_gradient(level_num)
+        top, bottom = Level.CAVE_SKY if level_num == 3 else Level.SKY_COLORS[min(level_num, 2)]
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for y in range(SCREEN_HEIGHT):
+                progress = y / SCREEN_HEIGHT
+                r = int(top[0] * (1 - progress) + bottom[0] * progress)
+                g = int(top[1] * (1 - progress) + bottom[1] * progress)
+                b = int(top[2] * (1 - progress) + bottom[2] * progress)
+                pygame.draw.line(reference, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+        per_line = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            screen.blit(sky, (0, 0))
+        cached = (time.perf_counter() - start) / rounds
+        print(f"level {level_num + 1}: lines {per_line * 1000:.3f} ms, cached {cached * 1000:.3f} ms "
+              f"({per_line / cached:.0f}x)")
+
+
+def parallax_layers(rounds=300):
+    """Time drawing the background objects one by one against the layer strips"""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for level_num in range(len(Level.LEVEL_FILES)):
+        level = Level(level_num)
+        objects = level.background_objects
+        per_object = layered = 0
+        for i in range(rounds):
+            scroll_x = i * (level.width - SCREEN_WIDTH) / rounds
+            for layer in level.parallax_layers:
+                start = time.perf_counter()
+                for j in range(len(objects)):
+                    parallax_x = objects.xs[j] - int(scroll_x * layer.factor)
+                    if objects.types[j] in layer.type_ids and -300 < parallax_x < SCREEN_WIDTH + 300:
+                        Level.draw_background_object(screen, BackgroundObjects.TYPES[objects.types[j]],
+                                                     parallax_x, objects.ys[j], objects.sizes[j])
+                per_object += time.perf_counter() - start
+
+                start = time.perf_counter()
+                layer.draw(screen, scroll_x)
+                layered += time.perf_counter() - start
+        print(f"level {level_num + 1}: {len(objects)} objects, "
+              f"per object {per_object / rounds * 1000:.3f} ms, strips {layered / rounds * 1000:.3f} ms")
+
+
+def background_density(counts=(30, 3000, 30000), step=8):
+    """Scroll level 2 with more and more forest trees and time the layer"""
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for count in counts:
+        level = Level(1)
+        rng = random.Random(count)
+        level.background_objects = BackgroundObjects(
+            ('forest_tree', rng.randint(0, level.width), rng.randint(SCREEN_HEIGHT - 150, SCREEN_HEIGHT - 50),
+             rng.randint(80, 150)) for _ in range(count))
+        level.build_parallax_layers()
+        layer = level.parallax_layers[0]
+        times = []
+        most_strips = 0
+        for scroll_x in range(0, level.width - SCREEN_WIDTH, step):
+            start = time.perf_counter()
+            layer.draw(screen, scroll_x)
+            times.append(time.perf_counter() - start)
+            most_strips = max(most_strips, len(layer.strips))
+        # Back over the last few strips, which were dropped on the way
+        back = 0
+        for scroll_x in range(level.width - SCREEN_WIDTH - step, level.width - 4 * SCREEN_WIDTH, -step):
+            start = time.perf_counter()
+            layer.draw(screen, scroll_x)
+            back = max(back, time.perf_counter() - start)
+        times.sort()
+        print(f"{count} objects: median {times[len(times) // 2] * 1e6:.0f} us per frame, "
+              f"worst {times[-1] * 1000:.2f} ms (a strip coming into view), "
+              f"at most {most_strips} strips resident, worst {back * 1000:.2f} ms scrolling back")
+
+
+def enemy_swarm(counts=(100, 1000, 5000), frames=300):
+    """Time snails and caterpillars stepped as Enemy objects and in an EnemySwarm"""
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    level = Level(0)
+    player_rect = pygame.Rect(-1000, 0, 60, 90)
+    for count in counts:
+        rng = random.Random(count)
+        records = []
+        for spawn_id in range(count):
+            x = rng.randint(100, 2800)
+            ground = next((y for y in range(0, level.grid_rows * Level.TILE_SIZE, Level.TILE_SIZE)
+                           if level.solid_in_area(x, y, 1, 1)), 400)
+            records.append((x, ground - 40,
+                            rng.choice(["snail", "caterpillar"]), None, spawn_id))
+        enemies = [Enemy(x, y, enemy_type) for x, y, enemy_type, health, spawn_id in records]
+        swarm = EnemySwarm(level)
+        swarm.add(records)
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            for enemy in enemies:
+                enemy.update(player_rect, level, 0, [], [])
+        per_object = (time.perf_counter() - start) / frames
+        start = time.perf_counter()
+        for _ in range(frames):
+            swarm.update()
+        batched = (time.perf_counter() - start) / frames
+        print(f"{count} walkers: objects {per_object * 1000:.2f} ms/frame, swarm {batched * 1000:.2f} ms/frame "
+              f"({per_object / batched:.1f}x)")
+
+
+def projectile_barrage(counts=(100, 500, 2000), frames=300):
+    """Run a boss barrage topped up to each count as a list of Projectiles
+    (the old per-shot loops) and in a ProjectilePool, and time both"""
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    level = Level(0)
+    player_rect = pygame.Rect(300, 300, 60, 90)
+    boss_rect = pygame.Rect(900, 150, 250, 200)
+
+    def fire(rng):
+        angle = rng.uniform(0, math.pi * 2)
+        shot = Projectile(boss_rect.centerx, boss_rect.centery + 20, math.cos(angle), False, 2)
+        shot.vel_y = math.sin(angle) * 2
+        return shot
+
+    def move(shots):
+        kept = []
+        for shot in shots:
+            shot.rect.x += shot.vel_x
+            shot.rect.y += shot.vel_y
+            rect = shot.rect
+            if not (rect.right < -500 or rect.left > SCREEN_WIDTH + 100
+                    or rect.top > SCREEN_HEIGHT + 100 or rect.bottom < -100):
+                kept.append(shot)
+        return kept
+
+    for count in counts:
+        shots = []
+        rng = random.Random(count)
+        live = 0
+        start = time.perf_counter()
+        for _ in range(frames):
+            shots.extend(fire(rng) for _ in range(count - len(shots)))
+            shots = move(shots)
+            for shot in shots:
+                for rect in level.query_rect(shot.rect):
+                    if shot.rect.colliderect(rect):
+                        shot.vel_x = 0
+                        break
+            shots = move(shots)
+            for shot in shots:
+                if player_rect.colliderect(shot.rect):
+                    shot.vel_x = 0
+            shots = [shot for shot in shots if shot.vel_x != 0]
+            live += len(shots)
+        per_shot = (time.perf_counter() - start) / frames
+        list_live = live / frames
+
+        pool = ProjectilePool()
+        rng = random.Random(count)
+        live = 0
+        start = time.perf_counter()
+        for _ in range(frames):
+            pool.extend(fire(rng) for _ in range(count - len(pool)))
+            pool.step(level, 0)
+            for i in pool.overlapping(player_rect, False):
+                pool.spend(i)
+            pool.compact()
+            live += len(pool)
+        batched = (time.perf_counter() - start) / frames
+        print(f"{count} shots: list {per_shot * 1000:.2f} ms/frame ({list_live:.0f} live), "
+              f"pool {batched * 1000:.2f} ms/frame ({live / frames:.0f} live), "
+              f"{per_shot / batched:.1f}x")
+
+
+def particle_throughput(counts=(1000, 10000), frames=120):
+    """Keep each count of death-burst particles alive, updated and drawn
+    the old way (a Python object and a fresh SRCALPHA surface per particle
+    per frame) and through a ParticleSystem, and time both"""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    colors = Game.DEATH_COLORS["snail"]
+    for count in counts:
+        rng = random.Random(count)
+        bursts = count // 25
+        particles = []
+        start = time.perf_counter()
+        for _ in range(frames):
+            # A steady stream of 25-particle bursts across the screen
+            while len(particles) < count - 24:
+                x, y = rng.uniform(0, SCREEN_WIDTH), rng.uniform(100, SCREEN_HEIGHT - 100)
+                for _ in range(25):
+                    color = tuple(rng.randint(low, high) for low, high in zip(*colors))
+                    particles.append([x, y, rng.uniform(-6, 6), rng.uniform(-8, -3), rng.randint(2, 6),
+                                      0, rng.randint(40, 80), color])
+            kept = []
+            for particle in particles:
+                particle[0] += particle[2]
+                particle[1] += particle[3]
+                particle[3] += 0.1
+                particle[2] *= 0.98
+                particle[3] *= 0.99
+                particle[5] += 1
+                particle[4] = max(0, particle[4] - 0.05)
+                if particle[5] < particle[6]:
+                    kept.append(particle)
+            particles = kept
+            for x, y, vel_x, vel_y, size, age, lifespan, color in particles:
+                surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                pygame.draw.circle(surf, (*color, int(255 * (1 - age / lifespan))), (size, size), size)
+                screen.blit(surf, (x - size * 2, y - size * 2))
+        per_object = (time.perf_counter() - start) / frames
+
+        system = ParticleSystem()
+        system.rng = np.random.default_rng(count)
+        live = 0
+        start = time.perf_counter()
+        for _ in range(frames):
+            while len(system) < count - 24:
+                system.emit(rng.uniform(0, SCREEN_WIDTH), rng.uniform(100, SCREEN_HEIGHT - 100), 25,
+                            colors, ((-6, 6), (-8, -3)), (40, 80))
+            system.update()
+            system.draw(screen, 0)
+            live += len(system)
+        batched = (time.perf_counter() - start) / frames
+        print(f"{count} particles ({bursts} bursts live): objects {per_object * 1000:.2f} ms/frame, "
+              f"system {batched * 1000:.2f} ms/frame ({per_object / batched:.1f}x), "
+              f"{live / frames:.0f} live, {len(ParticleSystem._sprites)} sprites baked")
+
+
+def parallel_bake(workers=None):
+    """Bake every asset in this process, then over the process pool, with
+    the disk cache out of the way, and compare wall-clock times"""
+    store, AssetCache.store = AssetCache.store, None
+    try:
+        AssetCache.evict()
+        start = time.perf_counter()
+        AssetCache.bake_all()
+        serial = time.perf_counter() - start
+        AssetCache.evict()
+        baked, wall, in_workers = AssetCache.bake_all_parallel(workers)
+    finally:
+        AssetCache.store = store
+    print(f"{baked} assets: serial {serial:.2f}s, parallel {wall:.2f}s on {os.cpu_count()} cores "
+          f"({serial / wall:.1f}x; the workers' own estimate {in_workers / wall:.1f}x)")
+
+
+def blit_throughput(rounds=200):
+    """Blit every cached sprite to the display before and after conversion"""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    AssetCache.bake_all()
+    for kind in ["player_frames", "vehicle_frames", "enemy_scorpion", "boss"]:
+        AssetCache.get_flash_bank(kind)
+
+    def measure():
+        surfaces = list(AssetCache.all_surfaces())
+        batch = [(surf, ((i * 97) % (SCREEN_WIDTH - 100), (i * 61) % (SCREEN_HEIGHT - 100)))
+                 for i, surf in enumerate(surfaces)]
+        start = time.perf_counter()
+        for _ in range(rounds):
+            screen.blits(batch, doreturn=False)
+        return len(batch) * rounds / (time.perf_counter() - start)
+
+    before = measure()
+    AssetCache.convert_for_display()
+    after = measure()
+    print(f"display {screen.get_bitsize()}bpp: {before:,.0f} blits/s as baked, "
+          f"{after:,.0f} blits/s converted ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    globals()[sys.argv[1]]()
+    pygame.quit()
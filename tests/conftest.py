@@ -0,0 +1,34 @@
+"""Load the game for the tests as the module "game", with no window or sound"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# The game file's name is not a valid module name, so load it by path
+spec = importlib.util.spec_from_file_location(
+    "game", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "TransforrGAME_full-1.py"))
+sys.modules["game"] = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(sys.modules["game"])
+
+from game import SCREEN_WIDTH, SCREEN_HEIGHT, pygame, AssetCache, Level, LevelStore, SpriteStore
+
+
+@pytest.fixture(scope="session", autouse=True)
+def display():
+    """The (dummy) display the sprites convert against"""
+    return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stores(tmp_path_factory):
+    """Sprite and level caches in a temporary directory, so the tests
+    neither read nor overwrite the ones next to the game"""
+    saved = AssetCache.store, Level.store
+    AssetCache.store = SpriteStore(str(tmp_path_factory.mktemp("sprite_cache")))
+    Level.store = LevelStore(str(tmp_path_factory.mktemp("level_cache")))
+    yield
+    AssetCache.store, Level.store = saved
@@ -0,0 +1,110 @@
+"""Record what the original per-tile game produced, for the tests to replay.
+
+The tests check the compiled levels and the merged-collider physics against
+the game as it was before levels were compiled and colliders merged: each
+level's tiles, enemies and powerups as its parser built them, and player
+trajectories driven by seeded input through its per-tile collision loops.
+Regenerate tests/data/baseline.json from that version of the game with:
+
+    git show 8f95d9f:TransforrGAME_full-1.py > /tmp/baseline.py
+    SDL_VIDEODRIVER=dummy SDL_AUDIODRIVER=dummy python tests/record_baseline.py /tmp/baseline.py
+
+Moving platforms are left out of the trajectories: the original ones did not
+carry the player, so they are covered by their own tests instead.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import random
+import sys
+from collections import defaultdict
+
+FRAMES = 2400
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "baseline.json")
+
+
+def trajectory_digest(trajectory):
+    """sha1 over one "x,y,w,h,on_ground" line per frame"""
+    digest = hashlib.sha1()
+    for rect, on_ground in trajectory:
+        digest.update(("%d,%d,%d,%d,%d\n" % (*rect, on_ground)).encode())
+    return digest.hexdigest()
+
+
+def tiles_digest(tiles):
+    """sha1 over the sorted "col,row,glyph" lines of the solid tiles"""
+    return hashlib.sha1("".join("%d,%d,%s\n" % tile for tile in sorted(tiles)).encode()).hexdigest()
+
+
+def spawn(game, platforms):
+    """The original spawn point, lifted out of any ground it starts inside"""
+    player = game.Player(200, game.SCREEN_HEIGHT - 300)
+    rects = [platform.rect for platform in platforms]
+    hit = player.rect.collidelist(rects)
+    while hit != -1:
+        player.rect.bottom = rects[hit].top
+        hit = player.rect.collidelist(rects)
+    return player
+
+
+def record_level(game, level_num):
+    level = game.Level(level_num)
+    platforms = [p for p in level.platforms if not hasattr(p, "move_direction")]
+    glyphs = {(x, y): char for y, row in enumerate(game.Level.LEVELS[level_num]) for x, char in enumerate(row)}
+    tiles = [(p.rect.x // 64, p.rect.y // 64, glyphs[(p.rect.x // 64, p.rect.y // 64)]) for p in platforms]
+    enemies = sorted([e.rect.x // 64, e.rect.y // 64, e.type] for e in level.enemies)
+    powerups = sorted([(p.rect.x - 12) // 64, (p.rect.y - 12) // 64, p.type] for p in level.powerups)
+
+    level.platforms = platforms
+    rng = random.Random(level_num)
+    player = spawn(game, platforms)
+    keys = defaultdict(bool)
+    inputs = []
+    transforms = []
+    trajectory = []
+    for frame in range(FRAMES):
+        if frame % 30 == 0:
+            roll = rng.random()
+            keys[game.pygame.K_RIGHT] = roll < 0.7
+            keys[game.pygame.K_LEFT] = 0.7 <= roll < 0.9
+            keys[game.pygame.K_SPACE] = rng.random() < 0.4
+            inputs.append([frame, keys[game.pygame.K_RIGHT], keys[game.pygame.K_LEFT], keys[game.pygame.K_SPACE]])
+            if rng.random() < 0.15 and player.transform_cooldown == 0:
+                player.transform()
+                transforms.append(frame)
+        player.update(keys, level.platforms, level.scroll_x)
+        level.update(player, keys)
+        if player.dead:
+            player = spawn(game, platforms)
+        trajectory.append((tuple(player.rect), player.on_ground))
+
+    return {
+        "tiles": {"count": len(tiles), "sha1": tiles_digest(tiles)},
+        "enemies": enemies,
+        "powerups": powerups,
+        "trajectory": {
+            "frames": FRAMES,
+            "inputs": inputs,
+            "transforms": transforms,
+            # Every 100th frame in the clear, to show where a mismatch starts
+            "checkpoints": [[*rect, on_ground] for rect, on_ground in trajectory[::100]],
+            "sha1": trajectory_digest(trajectory),
+        },
+    }
+
+
+def main(baseline_path):
+    spec = importlib.util.spec_from_file_location("baseline_game", baseline_path)
+    game = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(game)
+    game.pygame.display.set_mode((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    levels = [record_level(game, level_num) for level_num in range(len(game.Level.LEVELS))]
+    os.makedirs(os.path.dirname(DATA_PATH), exist_ok=True)
+    with open(DATA_PATH, "w") as f:
+        json.dump({"levels": levels}, f, indent=1)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,146 @@
+"""AssetCache banks after display conversion, no baking once a level runs,
+and the parallel bake"""
+import pytest
+
+import game
+
+from game import SCREEN_WIDTH, pygame, AssetCache, Boss, Enemy, Game, GameState, Level
+
+
+def test_convert_for_display_keeps_banks_on_their_entries():
+    for kind in ["player_frames", "enemy_scorpion", "enemy_spider", "boss"]:
+        AssetCache.get_flash_bank(kind)
+    AssetCache.convert_for_display()
+    known = {id(surf) for surf in AssetCache.all_surfaces()}
+    for key, (frames, mirrored) in AssetCache._banks.items():
+        entry = AssetCache._entries[key]
+        if isinstance(entry, pygame.Surface):
+            assert frames == (entry,) and frames[0] is entry, key
+        else:
+            assert frames is entry, key
+        assert all(id(frame) in known for frame in frames + mirrored), key
+
+
+@pytest.mark.parametrize("level_num", range(len(Level.LEVEL_FILES)))
+def test_running_level_bakes_nothing(level_num):
+    AssetCache.evict()  # Start cold, whatever earlier tests baked
+    game = Game()
+    game.current_level = level_num
+    game.reset_game()
+    game.player.direction = -1  # Exercise the mirrored frames too
+    game.update()
+    game.draw()
+
+    allocs = AssetCache.surface_allocs
+    known = {id(surf) for surf in AssetCache.all_surfaces()}
+    # Carry the player across the whole level, so every band, enemy and
+    # powerup streams in while it runs
+    for frame, x in enumerate(range(game.player.rect.x, game.level.width, 16)):
+        game.player.rect.midbottom = (x, 200)
+        game.player.vel_y = 0
+        game.player.health = game.player.max_health
+        game.update()
+        if game.state == GameState.LEVEL_COMPLETE:
+            break
+        game.draw()
+        assert game.state == GameState.PLAYING
+        sprites = [game.player] + game.level.enemies + ([game.level.boss] if game.level.boss else [])
+        assert all(id(sprite.image) in known for sprite in sprites), f"frame {frame}"
+    assert game.level.scroll_x > game.level.width - 2 * SCREEN_WIDTH
+    assert AssetCache.surface_allocs == allocs
+
+
+@pytest.mark.parametrize("enemy_type", ["bee", "mantis", "spider", "snail", "scorpion"])
+def test_only_turning_enemies_get_mirrored_frames(enemy_type):
+    AssetCache.evict("enemy_" + enemy_type)
+    enemy = Enemy(0, 0, enemy_type)
+    mirrored = ("enemy_" + enemy_type, ()) in AssetCache._banks
+    assert mirrored == (enemy_type in Enemy.MIRRORED_TYPES)
+    assert len(enemy.frame_bank) == (2 if mirrored else 1)
+    assert enemy.image is enemy.frame_bank[0][0]
+
+
+def test_boss_hit_flash_uses_unmirrored_tints():
+    AssetCache.evict("boss")
+    allocs = AssetCache.surface_allocs
+    boss = Boss(900, 150)
+    assert ("boss", ()) not in AssetCache._banks and ("boss", ()) not in AssetCache._flash_banks
+    # The frames and one tinted copy of each, nothing mirrored
+    assert AssetCache.surface_allocs - allocs == 2 * len(boss.frames)
+
+    assert boss.take_damage(1)
+    shown = []
+    for _ in range(12):
+        boss.update(pygame.Rect(300, 300, 60, 90), [], 0, [])
+        shown.append(boss.image)
+    flashes = [image for image in shown if image in boss.flash_frames]
+    assert flashes
+    for image in flashes:
+        frame = boss.frames[boss.flash_frames.index(image)]
+        assert image.get_size() == frame.get_size()
+        assert pygame.image.tobytes(image, "RGBA") != pygame.image.tobytes(frame, "RGBA")
+    # Back to the plain frames once the hit wears off
+    assert boss.image is boss.frames[boss.current_frame]
+
+
+@pytest.mark.parametrize("level_num", range(len(Level.LEVEL_FILES)))
+def test_preload_builds_exactly_the_manifest(level_num):
+    AssetCache.get_bank("enemy_bee")  # Left over from elsewhere, not in any manifest
+    manifest = Level.asset_manifest(level_num)
+    AssetCache.preload(manifest)
+    for view, cache in [("bank", AssetCache._banks), ("flash_bank", AssetCache._flash_banks),
+                        ("flash", AssetCache._flashes)]:
+        assert {(view, (kind,) + params) for kind, params in cache} == {
+            (kind, params) for kind, params in manifest if kind == view}
+
+
+def test_evict_frees_atlas_pages():
+    AssetCache.bake_all()
+    AssetCache.get_flash("boss")
+    pages = len(AssetCache.atlas.pages)
+    allocs = AssetCache.surface_allocs
+    assert AssetCache.evict("boss") == 1
+    assert len(AssetCache.atlas.pages) < pages
+    assert AssetCache.surface_allocs == allocs
+    assert all(surf.get_parent() in AssetCache.atlas.pages + AssetCache.opaque_atlas.pages
+               for surf in AssetCache.all_surfaces() if surf.get_parent() is not None)
+    AssetCache.evict()
+    assert AssetCache.atlas.pages == [] and AssetCache.opaque_atlas.pages == []
+
+
+# Generators that draw without random(), so both bakes give the same pixels
+DETERMINISTIC = ["player_frames", "vehicle_frames", "enemy_scorpion", "enemy_snail", "boss"]
+
+
+def pixels(asset, compare_pixels):
+    return [(surf.get_size(), pygame.image.tobytes(surf, "RGBA") if compare_pixels else None)
+            for surf in ((asset,) if isinstance(asset, pygame.Surface) else asset)]
+
+
+def bake_results():
+    return {key: pixels(asset, key[0] in DETERMINISTIC) for key, asset in AssetCache._entries.items()}
+
+
+def test_parallel_bake_matches_serial(monkeypatch):
+    monkeypatch.setattr(AssetCache, "store", None)
+    AssetCache.evict()
+    AssetCache.bake_all()
+    serial = bake_results()
+    AssetCache.evict()
+    baked, wall, in_workers = AssetCache.bake_all_parallel(2)
+    assert baked == len(AssetCache.ALL_ASSETS)
+    assert 0 < in_workers and 0 < wall
+    assert bake_results() == serial
+
+
+def test_parallel_bake_skips_the_pool_on_one_core(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a pool cannot win on one core")
+
+    monkeypatch.setattr(AssetCache, "store", None)
+    monkeypatch.setattr(game.os, "cpu_count", lambda: 1)
+    monkeypatch.setattr(game, "ProcessPoolExecutor", no_pool)
+    AssetCache.evict()
+    baked, wall, serial = AssetCache.bake_all_parallel()
+    assert baked == len(AssetCache.ALL_ASSETS) and serial == wall
+    assert set(AssetCache._entries) == set(AssetCache.ALL_ASSETS)
@@ -0,0 +1,107 @@
+"""Player physics against merged colliders, replayed against the original
+per-tile game (see record_baseline.py)"""
+import json
+import random
+from collections import defaultdict
+
+import pytest
+
+from game import SCREEN_WIDTH, pygame, Level, SpatialHash
+from record_baseline import DATA_PATH, trajectory_digest
+
+with open(DATA_PATH) as f:
+    BASELINE = json.load(f)["levels"]
+
+
+def restream(level, merged, linear):
+    """Reload a level's bands with per-tile or merged colliders, optionally
+    in a single-bucket spatial hash (i.e. a linear scan)"""
+    for band in list(level.bands):
+        level.unload_band(band)
+    level.merge_colliders = merged
+    level.spatial_hash = SpatialHash(cell_size=1 << 30) if linear else SpatialHash()
+    level.update_streaming()
+
+
+def replay(level_num, merged, linear):
+    """Drive a player through a level with the recorded input"""
+    recorded = BASELINE[level_num]["trajectory"]
+    inputs = {frame: (right, left, space) for frame, right, left, space in recorded["inputs"]}
+    transforms = set(recorded["transforms"])
+    level = Level(level_num)
+    level.moving_platforms = []  # The original ones did not carry the player
+    restream(level, merged, linear)
+    player = level.spawn_player()
+    keys = defaultdict(bool)
+    trajectory = []
+    for frame in range(recorded["frames"]):
+        if frame in inputs:
+            keys[pygame.K_RIGHT], keys[pygame.K_LEFT], keys[pygame.K_SPACE] = inputs[frame]
+        if frame in transforms:
+            assert player.transform_cooldown == 0, f"frame {frame}: cannot transform as recorded"
+            player.transform()
+        player.update(keys, level, level.scroll_x)
+        level.update(player, keys)
+        if player.dead:
+            player = level.spawn_player()
+        trajectory.append((tuple(player.rect), player.on_ground))
+    return trajectory
+
+
+@pytest.mark.parametrize("merged, linear", [(False, True), (True, True), (True, False)],
+                         ids=["per-tile", "merged", "merged-hashed"])
+@pytest.mark.parametrize("level_num", range(len(BASELINE)))
+def test_trajectory_matches_per_tile_original(level_num, merged, linear):
+    recorded = BASELINE[level_num]["trajectory"]
+    trajectory = replay(level_num, merged, linear)
+    checkpoints = [[*rect, on_ground] for rect, on_ground in trajectory[::100]]
+    for frame, (expected, actual) in enumerate(zip(recorded["checkpoints"], checkpoints)):
+        assert actual == expected, f"diverged by frame {frame * 100}"
+    assert trajectory_digest(trajectory) == recorded["sha1"]
+
+
+@pytest.mark.parametrize("level_num", range(len(BASELINE)))
+def test_merged_colliders_cover_the_tiles(level_num):
+    level = Level(level_num)
+    for band in range(-(-level.compiled.cols // Level.BAND_COLUMNS)):
+        if band not in level.bands:
+            level.load_band(band)
+    tiles = [platform.rect for band in level.bands.values() for platform in band.platforms]
+    colliders = [rect for band in level.bands.values() for rect in band.colliders]
+    assert len(colliders) < len(tiles)
+    area = sum(rect.w * rect.h for rect in colliders)
+    assert area == sum(rect.w * rect.h for rect in tiles)
+    assert all(rect.collidelist(colliders) != -1 for rect in tiles)
+    assert not any(a.colliderect(b) for i, a in enumerate(colliders) for b in colliders[i + 1:])
+
+
+@pytest.mark.parametrize("level_num", range(len(BASELINE)))
+def test_grid_probes_agree_with_colliders(level_num):
+    # The enemy ledge sensor asks the grid, the physics asks the colliders
+    level = Level(level_num)
+    for band in range(-(-level.compiled.cols // Level.BAND_COLUMNS)):
+        if band not in level.bands:
+            level.load_band(band)
+    rng = random.Random(level_num)
+    for _ in range(2000):
+        probe = pygame.Rect(rng.randrange(-100, level.width + 100), rng.randrange(-100, 800), 2, 2)
+        overlaps = any(probe.colliderect(rect) for rect in level.query_rect(probe))
+        assert level.solid_in_area(*probe) == overlaps, probe
+
+
+@pytest.mark.parametrize("index", range(3))
+def test_rider_stays_on_moving_platform(index):
+    # Level 4, where no moving platform runs into ground or a wall
+    level = Level(3)
+    platform = level.moving_platforms[index]
+    player = level.spawn_player()
+    player.rect.midbottom = platform.rect.midtop
+    level.scroll_x = player.rect.centerx - SCREEN_WIDTH // 2
+    offset = player.rect.x - platform.rect.x
+    keys = defaultdict(bool)
+    for _ in range(600):
+        player.update(keys, level, level.scroll_x)
+        level.update(player, keys)
+        assert player.rect.x - platform.rect.x == offset
+    assert platform.rect.x != platform.start_x
+    assert player.rect.bottom == platform.rect.top
@@ -0,0 +1,57 @@
+"""EnemySwarm against the same walkers stepped as Enemy objects"""
+import random
+
+import pytest
+
+from game import pygame, Enemy, EnemySwarm, Level
+
+FAR_AWAY = pygame.Rect(-1000, 0, 60, 90)
+
+
+def walkers(level, count, seed, types=EnemySwarm.TYPES):
+    """Spawn records dropped onto the ground of level 1, and their directions"""
+    rng = random.Random(seed)
+    records = []
+    for spawn_id in range(count):
+        x = rng.randint(100, 2800)
+        ground = next((y for y in range(0, level.grid_rows * Level.TILE_SIZE, Level.TILE_SIZE)
+                       if level.solid_in_area(x, y, 1, 1)), 400)
+        records.append((x, ground - 40, rng.choice(types), None, spawn_id))
+    return records, [rng.choice([-1, 1]) for _ in records]
+
+
+@pytest.mark.parametrize("types", [("snail", "caterpillar"), EnemySwarm.TYPES], ids=["walkers", "all types"])
+def test_swarm_steps_like_enemy_objects(types):
+    level = Level(0)
+    records, directions = walkers(level, 200, len(types), types)
+    enemies = []
+    for (x, y, enemy_type, health, spawn_id), direction in zip(records, directions):
+        enemy = Enemy(x, y, enemy_type)
+        enemy.move_direction = direction
+        enemies.append(enemy)
+    swarm = EnemySwarm(level)
+    swarm.add(records)
+    swarm.direction[:] = directions
+
+    for frame in range(300):
+        object_events = sorted((i, event) for i, enemy in enumerate(enemies)
+                               if (event := enemy.update(FAR_AWAY, level, 0, [], [])))
+        swarm_events = sorted((int(i), event) for indices, event in swarm.update() for i in indices)
+        assert swarm_events == object_events, f"frame {frame}"
+
+    for i, enemy in enumerate(enemies):
+        assert (enemy.rect.x, enemy.rect.y, enemy.move_direction, enemy.current_frame, enemy.on_ground) == (
+            swarm.x[i], swarm.y[i], swarm.direction[i], swarm.current_frame[i], swarm.on_ground[i]), f"enemy {i}"
+
+
+def test_retired_walkers_come_back_as_they_left():
+    level = Level(0)
+    records, directions = walkers(level, 50, 0)
+    swarm = EnemySwarm(level)
+    swarm.add(records)
+    swarm.health[:] = 1
+    retired = swarm.retire(1000, 2000)
+    assert len(retired) + len(swarm) == 50
+    assert all(health == 1 for x, y, enemy_type, health, spawn_id in retired)
+    assert all(not 1000 <= x <= 2000 for x, y, enemy_type, health, spawn_id in retired)
+    assert sorted(swarm.spawn_id.tolist() + [record[4] for record in retired]) == list(range(50))
@@ -0,0 +1,84 @@
+"""Compiled level tables against the levels the original game parsed, and
+the on-disk cache of LevelStore"""
+import json
+import os
+import shutil
+
+import pytest
+
+from game import Level, LevelStore
+from record_baseline import DATA_PATH, tiles_digest
+
+with open(DATA_PATH) as f:
+    BASELINE = json.load(f)["levels"]
+
+
+def solid_tiles(compiled):
+    """(col, row, glyph) of every solid cell of a compiled level"""
+    return [(index // compiled.rows, index % compiled.rows, Level.SOLID_GLYPHS[code - 1])
+            for index, code in enumerate(compiled.tiles) if code]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LevelStore(str(tmp_path))
+
+
+@pytest.mark.parametrize("level_num", range(len(BASELINE)))
+def test_compiled_level_matches_original_parse(store, level_num):
+    compiled = store.load(Level.LEVEL_FILES[level_num])
+    expected = BASELINE[level_num]
+    tiles = solid_tiles(compiled)
+    assert len(tiles) == expected["tiles"]["count"]
+    assert tiles_digest(tiles) == expected["tiles"]["sha1"]
+    spawns = sorted([col, row, Level.SPAWN_TYPES[code]]
+                    for index, code, col, row in compiled.spawns_in(0, compiled.cols))
+    assert spawns == expected["enemies"]
+    powerups = sorted([col, row, Level.POWERUP_TYPES[code]]
+                      for index, code, col, row in compiled.powerups_in(0, compiled.cols))
+    assert powerups == expected["powerups"]
+
+
+def test_band_queries_partition_the_tables(store):
+    compiled = store.load(Level.LEVEL_FILES[0])
+    everything = compiled.spawns_in(0, compiled.cols)
+    banded = [record for first in range(0, compiled.cols, Level.BAND_COLUMNS)
+              for record in compiled.spawns_in(first, first + Level.BAND_COLUMNS)]
+    assert banded == everything
+
+
+def test_compiled_file_is_reused(store, tmp_path):
+    source = Level.LEVEL_FILES[1]
+    compiled = store.load(source)
+    reloaded = LevelStore(str(tmp_path)).load(source)
+    assert bytes(reloaded.data) == bytes(compiled.data)
+    assert bytes(reloaded.data) == LevelStore.compile(source, LevelStore.source_stamp(source))
+
+
+def test_edited_source_recompiles(store, tmp_path):
+    source = str(tmp_path / "level.txt")
+    shutil.copy(Level.LEVEL_FILES[0], source)
+    before = len(solid_tiles(store.load(source)))
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("\nXXXX\n")
+    # A fresh store, so only the stamp in the header can tell the file is stale
+    compiled = LevelStore(str(tmp_path)).load(source)
+    assert len(solid_tiles(compiled)) == before + 4
+
+
+def test_foreign_compiled_file_is_replaced(store, tmp_path):
+    source = Level.LEVEL_FILES[2]
+    with open(os.path.join(str(tmp_path), "level3.bin"), "wb") as f:
+        f.write(b"not a level")
+    compiled = store.load(source)
+    assert bytes(compiled.data) == LevelStore.compile(source, LevelStore.source_stamp(source))
+
+
+def test_levels_share_the_padded_grid(store):
+    compiled = store.load(Level.LEVEL_FILES[0])
+    grid = compiled.solid_grid()
+    assert grid is compiled.solid_grid()
+    assert grid.shape == (compiled.cols + 2, compiled.rows + 2)
+    assert not grid[0].any() and not grid[-1].any() and not grid[:, 0].any() and not grid[:, -1].any()
+    assert grid.sum() == len(solid_tiles(compiled))
+    assert Level(0).solid_grid is Level(0).solid_grid
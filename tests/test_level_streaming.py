@@ -0,0 +1,60 @@
+"""What survives a band of the level unloading and loading again"""
+from collections import defaultdict
+
+import pytest
+
+from game import Game, Projectile
+
+
+def scroll(level, scroll_x):
+    level.scroll_x = scroll_x
+    level.update_streaming()
+    level.update_activation()
+
+
+@pytest.fixture
+def game():
+    game = Game()
+    game.current_level = 0
+    game.reset_game()
+    return game
+
+
+def test_killed_enemy_stays_dead(game):
+    level = game.level
+    scroll(level, 0)
+    enemy = level.enemies[0]
+    enemy.health = 1
+    game.projectiles.append(Projectile(enemy.rect.x, enemy.rect.y, 1))
+    game.hit_enemies()
+    assert enemy not in level.enemies
+
+    scroll(level, 8000)
+    scroll(level, 0)
+    assert enemy.spawn_id not in [other.spawn_id for other in level.enemies]
+
+
+def test_wounded_enemy_keeps_its_health(game):
+    level = game.level
+    scroll(level, 2500)
+    enemy = level.enemies[0]
+    enemy.health = 1
+
+    scroll(level, 8000)
+    assert enemy.spawn_id not in [other.spawn_id for other in level.enemies]
+    scroll(level, 2500)
+    assert [other.health for other in level.enemies if other.spawn_id == enemy.spawn_id] == [1]
+
+
+def test_collected_powerup_stays_collected(game):
+    level = game.level
+    scroll(level, 2500)
+    powerup = level.powerups[0]
+    game.player.rect.center = powerup.rect.center
+    level.update(game.player, defaultdict(bool))
+    assert powerup not in level.powerups
+
+    scroll(level, 8000)
+    scroll(level, 2500)
+    assert powerup.powerup_id not in [other.powerup_id for other in level.powerups]
+    assert level.powerups, "the other powerups of the band came back"
@@ -0,0 +1,82 @@
+"""ParticleSystem against the old per-object Particle.update, and its
+sprite cache"""
+import numpy as np
+import pytest
+
+from game import SCREEN_WIDTH, SCREEN_HEIGHT, pygame, Game, ParticleSystem
+
+
+def old_update(particle):
+    """Particle.update before the system, on a dict of the same fields"""
+    particle["x"] += particle["vel_x"]
+    particle["y"] += particle["vel_y"]
+    particle["vel_y"] += 0.1  # Gravity
+    particle["vel_x"] *= 0.98
+    particle["vel_y"] *= 0.99
+    particle["age"] += 1
+    particle["rotation"] += particle["rotation_speed"]
+    particle["size"] = max(0, particle["size"] - (0.02 if particle["sparkle"] else 0.05))
+    return particle["age"] < particle["lifespan"]
+
+
+def snapshot(system):
+    return [{name: getattr(system, name)[i].item() for name, dtype in ParticleSystem.FIELDS}
+            for i in range(len(system))]
+
+
+@pytest.fixture
+def system():
+    system = ParticleSystem()
+    system.rng = np.random.default_rng(0)
+    for i in range(20):
+        system.emit(60 * i, 300, 25, Game.DEATH_COLORS["snail"], ((-6, 6), (-8, -3)), (40, 80))
+    system.emit(640, 200, 30, (255, 215, 0), ((-3, 3), (-3, 3)), 60, particle_type="sparkle")
+    return system
+
+
+def test_update_matches_particle_update(system):
+    particles = snapshot(system)
+    for frame in range(100):
+        particles = [particle for particle in particles if old_update(particle)]
+        system.update()
+        assert snapshot(system) == particles, f"frame {frame}"
+    assert len(system) == 0
+
+
+def test_expired_particles_are_dropped_in_order(system):
+    system.age[:len(system)] = 10
+    system.lifespan[:len(system)] = np.arange(len(system)) % 3 + 10
+    before = snapshot(system)
+    system.update()
+    assert [particle["lifespan"] for particle in snapshot(system)] == [
+        particle["lifespan"] for particle in before if particle["lifespan"] > 11]
+
+
+def test_sprites_are_baked_once(system):
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    system.draw(screen, 0)
+    sprites = dict(ParticleSystem._sprites)
+    assert sprites
+    system.draw(screen, 0)
+    assert ParticleSystem._sprites == sprites
+    assert all(ParticleSystem.sprite(key) is sprite for key, sprite in sprites.items())
+    # Later frames mostly land on sprites baked already
+    drawn = 0
+    for _ in range(10):
+        system.update()
+        system.draw(screen, 0)
+        drawn += len(system)
+    assert len(ParticleSystem._sprites) - len(sprites) < drawn // 10
+
+
+@pytest.mark.parametrize("enemy_type", sorted(Game.DEATH_COLORS))
+def test_snapped_colors_share_the_palette(enemy_type):
+    low, high = Game.DEATH_COLORS[enemy_type]
+    system = ParticleSystem()
+    system.emit(0, 0, 500, (low, high))
+    colors = {ParticleSystem.palette[color_id] for color_id in system.color[:len(system)].tolist()}
+    for color in colors:
+        for channel, lo, hi in zip(color, low, high):
+            assert lo <= channel <= hi, color
+            assert channel % ParticleSystem.COLOR_STEP == 0 or channel in (lo, hi), color
+    assert len(colors) < 50
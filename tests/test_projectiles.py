@@ -0,0 +1,103 @@
+"""ProjectilePool against the old per-shot Projectile.update, and how shots
+land on walls and enemies"""
+import random
+
+import pytest
+
+from game import SCREEN_WIDTH, SCREEN_HEIGHT, pygame, Enemy, Game, Level, Projectile, ProjectilePool
+
+
+def old_update(shot, scroll_x):
+    """Projectile.update before the pool: move, then drop shots off screen"""
+    shot.rect.x += shot.vel_x
+    shot.rect.y += shot.vel_y
+    return not (shot.rect.right < scroll_x - 500 or shot.rect.left > scroll_x + SCREEN_WIDTH + 100
+                or shot.rect.top > SCREEN_HEIGHT + 100 or shot.rect.bottom < -100)
+
+
+def enemy_shot(x, y, vel_x, vel_y):
+    shot = Projectile(x, y, 1, False)
+    shot.vel_x = vel_x
+    shot.vel_y = vel_y
+    return shot
+
+
+@pytest.fixture(scope="module")
+def level():
+    return Level(0)
+
+
+@pytest.fixture
+def game():
+    game = Game()
+    game.reset_game()
+    game.level.enemies = []
+    return game
+
+
+def test_free_flight_matches_projectile_update(level):
+    # Rows 0 and 1 of level 1 are open sky, and the shots only climb out of them
+    rng = random.Random(0)
+    shots = [enemy_shot(rng.randint(-400, SCREEN_WIDTH), rng.randint(0, 100),
+                        rng.uniform(-6, 6), rng.uniform(-1.5, 0)) for _ in range(300)]
+    pool = ProjectilePool()
+    pool.extend(shots)
+    for frame in range(100):
+        # The game moved every shot twice a frame
+        shots = [shot for shot in shots if old_update(shot, 0)]
+        shots = [shot for shot in shots if old_update(shot, 0)]
+        assert pool.step(level, 0) == []
+        pool.compact()
+        assert [pool.rect(i) for i in range(len(pool))] == [shot.rect for shot in shots], f"frame {frame}"
+    assert 0 < len(pool) < 300
+
+
+def test_honey_drop_falls_until_it_lands(level):
+    # A drop has no horizontal speed; the old cleanup (vel_x == 0 means
+    # spent) removed it on its first frame
+    pool = ProjectilePool()
+    pool.append(enemy_shot(300, 0, 0, 3))
+    for frame in range(1, 11):
+        pool.step(level, 0)
+        assert pool.alive[0] and pool.rect(0).y == 6 * frame
+
+
+def test_wall_is_checked_after_each_move(level):
+    rows = level.compiled.rows
+    tiles = level.compiled.tiles
+    col, row = next((index // rows, index % rows) for index in range(rows, len(tiles))
+                    if tiles[index] and not tiles[index - rows])
+    wall_x, wall_y = col * Level.TILE_SIZE, row * Level.TILE_SIZE
+    pool = ProjectilePool()
+    # Clear of the wall after the first move, inside it after the second
+    pool.append(enemy_shot(wall_x - 12 - 6, wall_y + 20, 6, 0))
+    assert pool.step(level, wall_x - SCREEN_WIDTH // 2) == [0]
+    assert not pool.alive[0]
+    assert pool.overlapping(pool.rect(0), False) == []
+
+
+def test_spent_shots_hit_nothing():
+    pool = ProjectilePool()
+    pool.extend(Projectile(100, 100, 1) for _ in range(3))
+    assert pool.spend(1) == 1
+    assert pool.overlapping(pygame.Rect(90, 90, 60, 60), True) == [0, 2]
+    assert pool.overlapping(pygame.Rect(90, 90, 60, 60), False) == []
+
+
+def test_shot_hits_only_one_of_two_overlapping_enemies(game):
+    game.level.enemies = [Enemy(500, 300, "snail"), Enemy(500, 300, "snail")]
+    health = [enemy.health for enemy in game.level.enemies]
+    game.projectiles.append(Projectile(510, 310, 1))
+    game.hit_enemies()
+    assert sum(before - enemy.health for before, enemy in zip(health, game.level.enemies)) == 1
+    assert not game.projectiles.alive[0]
+
+
+def test_killed_enemy_takes_no_more_shots(game):
+    enemy = Enemy(500, 300, "snail")
+    enemy.health = 1
+    game.level.enemies = [enemy]
+    game.projectiles.extend([Projectile(510, 310, 1), Projectile(512, 310, 1)])
+    game.hit_enemies()
+    assert game.level.enemies == []
+    assert game.projectiles.alive[:2].tolist() == [False, True]
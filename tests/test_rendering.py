@@ -0,0 +1,61 @@
+"""Cached sky and parallax surfaces against drawing the scene piece by piece"""
+import pytest
+
+from game import SCREEN_WIDTH, SCREEN_HEIGHT, pygame, BackgroundObjects, Level, ParallaxLayer
+
+LEVELS = range(len(Level.LEVEL_FILES))
+
+
+@pytest.mark.parametrize("level_num", LEVELS)
+def test_sky_matches_line_by_line_gradient(level_num):
+    top, bottom = Level.CAVE_SKY if level_num == 3 else Level.SKY_COLORS[min(level_num, 2)]
+    reference = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for y in range(SCREEN_HEIGHT):
+        progress = y / SCREEN_HEIGHT
+        r = int(top[0] * (1 - progress) + bottom[0] * progress)
+        g = int(top[1] * (1 - progress) + bottom[1] * progress)
+        b = int(top[2] * (1 - progress) + bottom[2] * progress)
+        pygame.draw.line(reference, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen.blit(Level.sky_gradient(level_num), (0, 0))
+    for x in (0, SCREEN_WIDTH // 2, SCREEN_WIDTH - 1):
+        for y in range(SCREEN_HEIGHT):
+            assert screen.get_at((x, y)) == reference.get_at((x, y))
+
+
+@pytest.mark.parametrize("level_num", LEVELS)
+def test_parallax_strips_match_per_object_drawing(level_num):
+    level = Level(level_num)
+    objects = level.background_objects
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    reference = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for i in range(10):
+        scroll_x = i * (level.width - SCREEN_WIDTH) / 10
+        for layer in level.parallax_layers:
+            reference.fill((0, 0, 0))
+            for j in range(len(objects)):
+                parallax_x = objects.xs[j] - int(scroll_x * layer.factor)
+                if objects.types[j] in layer.type_ids and -300 < parallax_x < SCREEN_WIDTH + 300:
+                    Level.draw_background_object(reference, BackgroundObjects.TYPES[objects.types[j]],
+                                                 parallax_x, objects.ys[j], objects.sizes[j])
+            screen.fill((0, 0, 0))
+            layer.draw(screen, scroll_x)
+            differ = sum(screen.get_at((x, y)) != reference.get_at((x, y))
+                         for x in range(0, SCREEN_WIDTH, 4) for y in range(0, SCREEN_HEIGHT, 4))
+            assert differ == 0, f"scroll {scroll_x:.0f}: {differ} sampled pixels differ"
+
+
+def test_scrolling_back_reuses_dropped_strips():
+    level = Level(1)
+    layer = level.parallax_layers[0]
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    path = list(range(0, 6000, 50))
+    for scroll_x in path:
+        layer.draw(screen, scroll_x)
+    rendered = layer.rendered
+    assert layer.recent
+    # Back over the strips dropped last, then forward again
+    for scroll_x in path[::-1][:40] + path[-40:]:
+        layer.draw(screen, scroll_x)
+    assert layer.rendered == rendered
+    assert len(layer.recent) <= ParallaxLayer.RECENT_STRIPS
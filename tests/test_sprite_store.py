@@ -0,0 +1,49 @@
+"""SpriteStore entries and when editing the Assets code invalidates them"""
+import inspect
+
+from game import pygame, Assets, AssetCache, SpriteStore
+
+
+def flat_tile(with_grass=True):
+    return pygame.Surface((64, 64))
+
+
+def test_dependencies_follow_helper_calls():
+    assert SpriteStore.dependencies("platform_tiles") == ["create_platform_tiles", "create_tile"]
+    assert SpriteStore.dependencies("tile") == ["create_tile"]
+
+
+def test_editing_a_helper_invalidates_its_callers(tmp_path, monkeypatch):
+    store = SpriteStore(str(tmp_path))
+    tiles = AssetCache.get("platform_tiles")
+    store.save("platform_tiles", (), tiles)
+    assert store.load("platform_tiles", ()) is not None
+
+    monkeypatch.setattr(Assets, "create_tile", staticmethod(flat_tile))
+    # A fresh store, as on the next launch
+    assert SpriteStore(str(tmp_path)).load("platform_tiles", ()) is None
+
+
+def test_saved_frames_load_back_unchanged(tmp_path):
+    store = SpriteStore(str(tmp_path))
+    frames = AssetCache.get("enemy_scorpion")
+    store.save("enemy_scorpion", (), frames)
+    loaded = SpriteStore(str(tmp_path)).load("enemy_scorpion", ())
+    assert len(loaded) == len(frames)
+    for frame, copy in zip(frames, loaded):
+        assert copy.get_size() == frame.get_size()
+        assert pygame.image.tobytes(copy, "RGBA") == pygame.image.tobytes(frame, "RGBA")
+
+
+def test_missing_source_bakes_in_memory(tmp_path, monkeypatch):
+    def no_source(obj):
+        raise OSError("could not get source code")
+
+    # As in an install with only .pyc files
+    monkeypatch.setattr(inspect, "getsource", no_source)
+    store = SpriteStore(str(tmp_path))
+    monkeypatch.setattr(AssetCache, "store", store)
+    AssetCache.evict("tile")
+    assert AssetCache.get("tile", True).get_size() == (64, 64)
+    assert store.load("tile", (True,)) is None
+    assert list(tmp_path.iterdir()) == []